@@ -24,7 +24,7 @@ echo "🔧 Python path: $PYTHONPATH"
 echo ""
 echo "Available commands:"
 echo "  python agents/shared/constants.py      # Test configuration"
-echo "  python agents/shared/ipfs_client.py    # Test IPFS client"
+echo "  python agents/shared/ipfs_client_demo.py  # Test IPFS client"
 echo "  python -m pytest tests/               # Run tests"
 echo ""
 echo "Ready for development! 🎯" 
\ No newline at end of file
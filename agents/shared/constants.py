@@ -4,8 +4,47 @@ Centralized configuration to avoid code duplication
 """
 
 import os
-from typing import Dict, List
-from web3 import Web3
+import re
+import functools
+from dataclasses import dataclass
+from types import MappingProxyType
+
+@dataclass(frozen=True, slots=True)
+class _Env:
+    """Snapshot of the environment variables read by the shared configuration"""
+    ipfs_node_url: str
+    ipfs_max_concurrency: int
+    log_level: str
+    use_langgraph: bool
+    verifier_fast_path: bool
+    validate_addresses: bool
+    poa_hash_algo: str
+
+def _positive_int_env(name: str, default: int) -> int:
+    """Read a positive integer environment variable, naming the variable if it is invalid"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return number
+
+# Read the environment once per process; consumers use the constants below
+_ENV = _Env(
+    ipfs_node_url=os.getenv('IPFS_NODE_URL', '/ip4/127.0.0.1/tcp/5001'),
+    ipfs_max_concurrency=_positive_int_env('IPFS_MAX_CONCURRENCY', 8),
+    log_level=os.getenv('LOG_LEVEL', 'INFO'),
+    use_langgraph=os.getenv('USE_LANGGRAPH', '0') == '1',
+    verifier_fast_path=os.getenv('VERIFIER_FAST_PATH', '1') == '1',
+    validate_addresses=os.getenv('CHAOSCHAIN_VALIDATE_ADDRESSES') == '1',
+    poa_hash_algo=os.getenv('POA_HASH_ALGO', 'sha256')
+)
+if _ENV.poa_hash_algo not in ('sha256', 'blake3'):
+    raise ValueError(f"POA_HASH_ALGO must be 'sha256' or 'blake3', got {_ENV.poa_hash_algo!r}")
 
 # ==========================================
 # BLOCKCHAIN CONFIGURATION
@@ -35,6 +74,9 @@ GAS_LIMITS = {
 MAX_GAS_PRICE_GWEI = 50
 TX_TIMEOUT_SECONDS = 120
 CONFIRMATION_BLOCKS = 1
+RPC_MAX_CONCURRENCY = 4  # Concurrent transaction sends per process, to stay under RPC rate limits
+NONCE_RESYNC_SECONDS = 30  # Reconcile the locally tracked nonce with the chain at most this often
+GAS_PRICE_TTL_SECONDS = 15  # Reuse a fetched gas price for this long
 
 # ==========================================
 # STUDIO CONFIGURATION
@@ -47,6 +89,7 @@ SUPPORTED_ACTION_TYPES = [
     "KiranaAI_InventoryAudit", 
     "KiranaAI_ReorderAlert"
 ]
+_SUPPORTED_ACTION_TYPES_SET = frozenset(SUPPORTED_ACTION_TYPES)
 
 # Verification fee in ETH
 VERIFICATION_FEE_ETH = 0.0001
@@ -60,13 +103,16 @@ REPUTATION_WEIGHT = 1000  # Default reputation score
 # ==========================================
 
 # IPFS settings
-IPFS_NODE_URL = os.getenv('IPFS_NODE_URL', '/ip4/127.0.0.1/tcp/5001')
+IPFS_NODE_URL = _ENV.ipfs_node_url
 IPFS_GATEWAY_URL = "https://ipfs.io/ipfs/"
 IPFS_PIN_ON_UPLOAD = True
+IPFS_MAX_CONCURRENCY = _ENV.ipfs_max_concurrency  # Concurrent PoA uploads per process
 
 # PoA package configuration
 POA_PACKAGE_VERSION = "1.0"
 POA_SCHEMA_VERSION = "poa-package-v1"
+# Hash algorithm for uploaded PoA packages; blake3 is opt-in, since every verifier must have it
+POA_HASH_ALGO = _ENV.poa_hash_algo
 
 # ==========================================
 # AGENT CONFIGURATION
@@ -102,22 +148,23 @@ CONSENSUS_CONFIG = {
 # ==========================================
 
 # Sample inventory data for testing
-SAMPLE_STORES = [
+# Frozen (tuples of read-only mappings) since every agent shares these objects
+SAMPLE_STORES = tuple(MappingProxyType(store) for store in [
     {
         "store_id": "store_123",
         "name": "Electronics Superstore",
         "location": "Mumbai Central",
-        "sections": ["electronics", "accessories", "gaming"]
+        "sections": ("electronics", "accessories", "gaming")
     },
     {
         "store_id": "store_456", 
         "name": "Mobile World",
         "location": "Delhi CP",
-        "sections": ["smartphones", "tablets", "wearables"]
+        "sections": ("smartphones", "tablets", "wearables")
     }
-]
+])
 
-SAMPLE_INVENTORY_ITEMS = [
+SAMPLE_INVENTORY_ITEMS = tuple(MappingProxyType(item) for item in [
     {
         "sku": "LAPTOP001",
         "name": "Gaming Laptop Dell G15",
@@ -153,14 +200,14 @@ SAMPLE_INVENTORY_ITEMS = [
         "unit_price": 29990.00,
         "typical_quantity": 25
     }
-]
+])
 
 # ==========================================
 # LOGGING AND MONITORING
 # ==========================================
 
 # Logging configuration
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_LEVEL = _ENV.log_level
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
 # Monitoring intervals
@@ -172,6 +219,10 @@ METRICS_COLLECTION_INTERVAL_MINUTES = 10
 # LANGGRAPH AGENT CONFIGURATION
 # ==========================================
 
+# Run agents through their LangGraph workflows instead of calling the nodes directly
+WORKER_USE_LANGGRAPH = _ENV.use_langgraph
+VERIFIER_FAST_PATH = _ENV.verifier_fast_path
+
 # LangGraph workflow configuration
 AGENT_WORKFLOW_CONFIG = {
     "max_execution_time": 600,  # 10 minutes max per workflow
@@ -204,17 +255,35 @@ AGENT_STATES = [
 # UTILITY FUNCTIONS
 # ==========================================
 
+# web3 is imported inside the helpers that need it so that importing
+# constants does not pull in web3's dependency tree on agent startup
+
 def wei_to_eth(wei_amount: int) -> float:
     """Convert Wei to ETH"""
+    from web3 import Web3
     return Web3.from_wei(wei_amount, 'ether')
 
 def eth_to_wei(eth_amount: float) -> int:
     """Convert ETH to Wei"""
+    from web3 import Web3
     return Web3.to_wei(eth_amount, 'ether')
 
+# Translation table for stripping underscores with str.translate
+_DROP_UNDERSCORES = str.maketrans('', '', '_')
+
+def _normalize_contract_name(contract_name: str) -> str:
+    """Normalize a contract name so "DVNRegistryPOC" and "dvn_registry" match"""
+    return contract_name.lower().replace('poc', '').translate(_DROP_UNDERSCORES)
+
+# Contract addresses keyed by normalized name, built once at import
+_NORMALIZED_CONTRACT_ADDRESSES = {
+    _normalize_contract_name(name): address for name, address in CONTRACT_ADDRESSES.items()
+}
+
+@functools.lru_cache(maxsize=32)
 def get_contract_address(contract_name: str) -> str:
     """Get contract address by name"""
-    return CONTRACT_ADDRESSES.get(contract_name.lower().replace('poc', '').replace('_', ''))
+    return _NORMALIZED_CONTRACT_ADDRESSES.get(_normalize_contract_name(contract_name))
 
 def get_gas_limit(operation: str) -> int:
     """Get gas limit for operation"""
@@ -222,11 +291,22 @@ def get_gas_limit(operation: str) -> int:
 
 def is_valid_action_type(action_type: str) -> bool:
     """Check if action type is supported by KiranaAI Studio"""
-    return action_type in SUPPORTED_ACTION_TYPES
+    return action_type in _SUPPORTED_ACTION_TYPES_SET
+
+# Cheap format check run before web3's checksum validation
+_ADDRESS_RE = re.compile(r'^0x[0-9a-fA-F]{40}$')
+
+def validate_contract_addresses():
+    """Validate the configured contract addresses (static, so only needs to run once)"""
+    from web3 import Web3
+
+    for name, address in CONTRACT_ADDRESSES.items():
+        if not _ADDRESS_RE.match(address) or not Web3.is_address(address):
+            raise ValueError(f"Invalid contract address for {name}: {address}")
 
 # Environment validation
 def validate_environment():
-    """Validate required environment variables and configuration"""
+    """Validate required environment variables"""
     required_env_vars = [
         'PRIVATE_KEY',  # For signing transactions
     ]
@@ -235,13 +315,12 @@ def validate_environment():
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {missing_vars}")
     
-    # Validate contract addresses
-    for name, address in CONTRACT_ADDRESSES.items():
-        if not Web3.is_address(address):
-            raise ValueError(f"Invalid contract address for {name}: {address}")
-    
     print("✅ Environment validation passed")
 
+# Contract addresses are constants, so check them at import time when requested
+if _ENV.validate_addresses:
+    validate_contract_addresses()
+
 if __name__ == "__main__":
     # Test configuration
     print("ChaosChain DVN PoC - Configuration Test")
@@ -260,6 +339,7 @@ if __name__ == "__main__":
     print(f"\n🎯 Supported Actions: {', '.join(SUPPORTED_ACTION_TYPES)}")
     
     try:
+        validate_contract_addresses()
         validate_environment()
     except ValueError as e:
         print(f"⚠️  Environment validation warning: {e}")
@@ -3,24 +3,111 @@ IPFS Client for ChaosChain DVN PoC
 Handles uploading and retrieving PoA packages from IPFS
 """
 
-import json
+from __future__ import annotations
+
+import asyncio
 import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+import functools
+import importlib.util
+from collections.abc import Iterable, Iterator
+from typing import Any
 import os
-from datetime import datetime, timezone
-from pathlib import Path
 
-# Try to import IPFS client, but handle gracefully if not available
+import orjson
+
+from agents.shared.constants import IPFS_MAX_CONCURRENCY, IPFS_NODE_URL
+
+# Check for the IPFS client without importing it; it is only imported when connecting
+IPFS_AVAILABLE = importlib.util.find_spec("ipfshttpclient") is not None
+
+# BLAKE3 is used for mock content hashes and can be selected for package hashes
 try:
-    import ipfshttpclient
-    IPFS_AVAILABLE = True
+    import blake3
+    BLAKE3_AVAILABLE = True
 except ImportError:
-    IPFS_AVAILABLE = False
-    ipfshttpclient = None
+    BLAKE3_AVAILABLE = False
+    blake3 = None
+
+DEFAULT_HASH_ALGO = "sha256"
 
 logger = logging.getLogger(__name__)
 
+def _canonical_json(data: Any) -> bytes:
+    """
+    Serialize data to compact, key-sorted JSON bytes (used for hashing and upload)
+    
+    Always orjson: package hashes must be byte-identical on every node, and the stdlib
+    encoder formats some values (e.g. 1e-07) differently.
+    """
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+def _iter_json_pieces(data: Any) -> Iterator[bytes]:
+    """Yield the canonical JSON of data in pieces: dict members and list elements, recursively"""
+    if isinstance(data, dict):
+        if not data:
+            yield b"{}"
+            return
+        separator = b"{"
+        for key in sorted(data):
+            yield separator + _canonical_json(key) + b":"
+            yield from _iter_json_pieces(data[key])
+            separator = b","
+        yield b"}"
+    elif type(data) in (list, tuple):
+        if not data:
+            yield b"[]"
+            return
+        separator = b"["
+        for element in data:
+            yield separator
+            yield from _iter_json_pieces(element)
+            separator = b","
+        yield b"]"
+    else:
+        yield _canonical_json(data)
+
+def _iter_canonical_json(data: Any, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """
+    Yield the canonical JSON of data in chunks of about chunk_size bytes
+    
+    The chunks join to exactly _canonical_json(data). Containers are serialized member by
+    member (so e.g. inventory items one at a time), which bounds memory to one chunk plus
+    the largest scalar rather than the whole document.
+    """
+    buffer = bytearray()
+    for piece in _iter_json_pieces(data):
+        buffer += piece
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+def _load_json(raw: bytes) -> Any:
+    """Parse JSON bytes"""
+    return orjson.loads(raw)
+
+def _hash_hex(data: bytes, algo: str = DEFAULT_HASH_ALGO) -> str:
+    """Hex digest of data using the named algorithm ("sha256" or "blake3")"""
+    if algo == "blake3":
+        if not BLAKE3_AVAILABLE:
+            raise ValueError("blake3 hash requested but the blake3 package is not installed")
+        return blake3.blake3(data).hexdigest()
+    if algo == "sha256":
+        return hashlib.sha256(data).hexdigest()
+    raise ValueError(f"Unsupported hash algorithm: {algo}")
+
+# IPFS HTTP clients are shared per node URL so each IPFSClient instance does not
+# open its own connection and re-run the version check
+_verified_urls = set()
+
+@functools.lru_cache(maxsize=4)
+def _get_client(ipfs_url: str):
+    """Get a connected IPFS HTTP client for ipfs_url, reused across IPFSClient instances"""
+    import ipfshttpclient
+    return ipfshttpclient.connect(ipfs_url)
+
 class IPFSClient:
     """Client for interacting with IPFS for PoA package storage"""
     
@@ -32,7 +119,7 @@ class IPFSClient:
             ipfs_url: IPFS node URL (defaults to localhost or env var)
             mock_mode: Force mock mode for testing (auto-detected if None)
         """
-        self.ipfs_url = ipfs_url or os.getenv('IPFS_NODE_URL', '/ip4/127.0.0.1/tcp/5001')
+        self.ipfs_url = ipfs_url or IPFS_NODE_URL
         self.client = None
         self.mock_mode = mock_mode
         
@@ -53,34 +140,58 @@ class IPFSClient:
             return
             
         try:
-            self.client = ipfshttpclient.connect(self.ipfs_url)
-            # Test connection
-            version = self.client.version()
-            logger.info(f"✅ Connected to IPFS node v{version['Version']}")
+            self.client = _get_client(self.ipfs_url)
+            # Test connection (once per node URL)
+            if self.ipfs_url not in _verified_urls:
+                version = self.client.version()
+                _verified_urls.add(self.ipfs_url)
+                logger.info(f"✅ Connected to IPFS node v{version['Version']}")
         except Exception as e:
             logger.warning(f"Failed to connect to IPFS at {self.ipfs_url}: {e}")
             logger.info("Enabling mock mode for development")
             self.mock_mode = True
             self.client = None
     
-    def _generate_mock_ipfs_hash(self, content: str) -> str:
+    def _generate_mock_ipfs_hash(self, content) -> str:
         """Generate a realistic IPFS hash for mock mode"""
+        if isinstance(content, str):
+            content = content.encode()
         # Create a hash that looks like a real IPFS hash (Qm...)
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
+        # Mock hashes need no CID interop, so use BLAKE3 when it is available
+        content_hash = _hash_hex(content, "blake3" if BLAKE3_AVAILABLE else "sha256")
         # IPFS hashes typically start with 'Qm' and are base58 encoded
         # For simplicity, we'll create a realistic-looking hash
         mock_hash = f"Qm{content_hash[:44]}"  # 46 character total like real IPFS hashes
         return mock_hash
     
+    def _generate_mock_chunks_hash(self, chunks: Iterable[bytes]) -> str:
+        """Generate a mock IPFS hash from content arriving in chunks (same hash as the joined bytes)"""
+        hasher = blake3.blake3() if BLAKE3_AVAILABLE else hashlib.sha256()
+        for chunk in chunks:
+            hasher.update(chunk)
+        return f"Qm{hasher.hexdigest()[:44]}"
+    
+    def _generate_mock_file_hash(self, file_path: str) -> str:
+        """Generate a mock IPFS hash from a file's content, streamed in 1 MiB chunks"""
+        if not os.path.isfile(file_path):
+            from datetime import datetime, timezone
+            # Nothing to hash (e.g. simulated evidence paths), fall back to path + timestamp
+            return self._generate_mock_ipfs_hash(f"{file_path}_{datetime.now(timezone.utc).isoformat()}")
+        
+        with open(file_path, 'rb') as f:
+            return self._generate_mock_chunks_hash(iter(lambda: f.read(1 << 20), b''))
+    
     def create_poa_package(
         self, 
         submission_id: str,
         studio_id: str,
         worker_agent_id: str,
         action_type: str,
-        inventory_data: Dict[str, Any],
-        evidence: Dict[str, Any] = None
-    ) -> Dict[str, Any]:
+        inventory_data: dict[str, Any],
+        evidence: dict[str, Any] = None,
+        hash_algo: str = DEFAULT_HASH_ALGO,
+        timestamp: str | None = None
+    ) -> dict[str, Any]:
         """
         Create a standardized PoA package structure
         
@@ -91,14 +202,24 @@ class IPFSClient:
             action_type: Type of action (e.g., "KiranaAI_StockReport")
             inventory_data: The actual inventory verification data
             evidence: Supporting evidence (photos, logs, etc.)
+            hash_algo: Algorithm for package_hash ("sha256" or "blake3"), recorded in metadata
+            timestamp: ISO timestamp to use (lets batch callers share one; defaults to now)
         
         Returns:
             Dict containing the PoA package structure
         """
+        if not timestamp:
+            from datetime import datetime, timezone
+            timestamp = datetime.now(timezone.utc).isoformat()
+        
+        if hash_algo == "blake3" and not BLAKE3_AVAILABLE:
+            logger.warning("blake3 not available, using sha256 for package hash")
+            hash_algo = "sha256"
+        
         package = {
             "submission_id": submission_id,
             "studio_id": studio_id,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": timestamp,
             "worker_agent_id": worker_agent_id,
             "action_type": action_type,
             "inventory_data": inventory_data,
@@ -106,18 +227,18 @@ class IPFSClient:
             "metadata": {
                 "version": "1.0",
                 "created_by": "chaoschain-dvn-poc",
-                "schema_version": "poa-package-v1"
+                "schema_version": "poa-package-v1",
+                "hash_algo": hash_algo
             }
         }
         
         # Calculate package hash
-        package_json = json.dumps(package, sort_keys=True, separators=(',', ':'))
-        package_hash = hashlib.sha256(package_json.encode()).hexdigest()
+        package_hash = _hash_hex(_canonical_json(package), hash_algo)
         package["package_hash"] = package_hash
         
         return package
     
-    def upload_poa_package(self, poa_package: Dict[str, Any]) -> Optional[str]:
+    def upload_poa_package(self, poa_package: dict[str, Any]) -> str | None:
         """
         Upload PoA package to IPFS
         
@@ -127,14 +248,12 @@ class IPFSClient:
         Returns:
             IPFS hash if successful, None otherwise
         """
-        # Convert to JSON for hashing
-        package_json = json.dumps(poa_package, indent=2, sort_keys=True)
-        
+        # Serialized in bounded chunks while hashing or uploading, so the full JSON
+        # document never sits in memory next to the package itself
         if self.mock_mode:
             # Generate mock IPFS hash
-            mock_hash = self._generate_mock_ipfs_hash(package_json)
+            mock_hash = self._generate_mock_chunks_hash(_iter_canonical_json(poa_package))
             logger.info(f"🎭 Mock IPFS upload: {mock_hash}")
-            logger.debug(f"Package size: {len(package_json)} bytes")
             return mock_hash
         
         if not self.client:
@@ -142,12 +261,10 @@ class IPFSClient:
             return None
         
         try:
-            # Upload to IPFS
-            result = self.client.add_json(poa_package)
-            ipfs_hash = result
+            # Upload to IPFS (add_bytes streams a generator body chunk by chunk)
+            ipfs_hash = self.client.add_bytes(_iter_canonical_json(poa_package))
             
             logger.info(f"✅ Successfully uploaded PoA package to IPFS: {ipfs_hash}")
-            logger.debug(f"Package size: {len(package_json)} bytes")
             
             # Pin the content to ensure availability
             try:
@@ -161,11 +278,46 @@ class IPFSClient:
         except Exception as e:
             logger.error(f"Failed to upload PoA package to IPFS: {e}")
             # Fallback to mock hash
-            mock_hash = self._generate_mock_ipfs_hash(package_json)
+            mock_hash = self._generate_mock_chunks_hash(_iter_canonical_json(poa_package))
             logger.warning(f"Using mock hash as fallback: {mock_hash}")
             return mock_hash
     
-    def retrieve_poa_package(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+    async def upload_poa_package_async(self, poa_package: dict[str, Any]) -> str | None:
+        """
+        Upload PoA package to IPFS without blocking the event loop
+        
+        The blocking upload runs in a worker thread, so several uploads awaited
+        together (e.g. with asyncio.gather) overlap their network round-trips.
+        
+        Args:
+            poa_package: PoA package dictionary
+        
+        Returns:
+            IPFS hash if successful, None otherwise
+        """
+        return await asyncio.to_thread(self.upload_poa_package, poa_package)
+    
+    async def upload_poa_packages_async(
+        self, poa_packages: list[dict[str, Any]]
+    ) -> list[str | None]:
+        """
+        Upload several PoA packages concurrently, at most IPFS_MAX_CONCURRENCY at a time
+        
+        Args:
+            poa_packages: PoA packages to upload
+        
+        Returns:
+            IPFS hashes in the same order as poa_packages
+        """
+        limit = asyncio.Semaphore(IPFS_MAX_CONCURRENCY)
+        
+        async def upload(pkg: dict[str, Any]) -> str | None:
+            async with limit:
+                return await self.upload_poa_package_async(pkg)
+        
+        return list(await asyncio.gather(*(upload(pkg) for pkg in poa_packages)))
+    
+    def retrieve_poa_package(self, ipfs_hash: str) -> dict[str, Any] | None:
         """
         Retrieve PoA package from IPFS
         
@@ -185,20 +337,22 @@ class IPFSClient:
             return None
         
         try:
-            # Retrieve from IPFS
-            package = self.client.get_json(ipfs_hash)
+            # Retrieve raw bytes from IPFS and parse them here rather than via get_json
+            package = _load_json(self.client.cat(ipfs_hash))
             
             logger.info(f"Successfully retrieved PoA package from IPFS: {ipfs_hash}")
             
             # Verify package hash if present
             if "package_hash" in package:
-                # Create a copy without the hash for verification
-                package_for_hash = {k: v for k, v in package.items() if k != "package_hash"}
-                package_json = json.dumps(package_for_hash, sort_keys=True, separators=(',', ':'))
-                calculated_hash = hashlib.sha256(package_json.encode()).hexdigest()
+                # The package was just decoded and is ours, so take the hash out for
+                # verification and put it back rather than copying the package
+                expected_hash = package.pop("package_hash")
+                hash_algo = package.get("metadata", {}).get("hash_algo", DEFAULT_HASH_ALGO)
+                calculated_hash = _hash_hex(_canonical_json(package), hash_algo)
+                package["package_hash"] = expected_hash
                 
-                if calculated_hash != package["package_hash"]:
-                    logger.error(f"Package hash mismatch! Expected: {package['package_hash']}, Got: {calculated_hash}")
+                if calculated_hash != expected_hash:
+                    logger.error(f"Package hash mismatch! Expected: {expected_hash}, Got: {calculated_hash}")
                     return None
                 
                 logger.debug("Package hash verification successful")
@@ -209,7 +363,7 @@ class IPFSClient:
             logger.error(f"Failed to retrieve PoA package from IPFS: {e}")
             return None
     
-    def upload_evidence_file(self, file_path: str) -> Optional[str]:
+    def upload_evidence_file(self, file_path: str) -> str | None:
         """
         Upload an evidence file (image, log, etc.) to IPFS
         
@@ -220,9 +374,8 @@ class IPFSClient:
             IPFS hash if successful, None otherwise
         """
         if self.mock_mode:
-            # Generate mock hash based on file path and timestamp
-            mock_content = f"{file_path}_{datetime.now(timezone.utc).isoformat()}"
-            mock_hash = self._generate_mock_ipfs_hash(mock_content)
+            # Generate mock hash from the file content
+            mock_hash = self._generate_mock_file_hash(file_path)
             logger.info(f"🎭 Mock evidence file upload: {mock_hash}")
             return mock_hash
         
@@ -254,12 +407,11 @@ class IPFSClient:
         except Exception as e:
             logger.error(f"Failed to upload evidence file to IPFS: {e}")
             # Fallback to mock hash
-            mock_content = f"{file_path}_{datetime.now(timezone.utc).isoformat()}"
-            mock_hash = self._generate_mock_ipfs_hash(mock_content)
+            mock_hash = self._generate_mock_file_hash(file_path)
             logger.warning(f"Using mock hash as fallback: {mock_hash}")
             return mock_hash
     
-    def get_ipfs_info(self) -> Dict[str, Any]:
+    def get_ipfs_info(self) -> dict[str, Any]:
         """
         Get IPFS node information
         
@@ -289,105 +441,3 @@ class IPFSClient:
             }
         except Exception as e:
             return {"status": "error", "message": str(e)}
-
-# Example usage and testing functions
-def create_sample_inventory_data() -> Dict[str, Any]:
-    """Create sample inventory data for testing"""
-    return {
-        "store_id": "store_123",
-        "scan_timestamp": datetime.now(timezone.utc).isoformat(),
-        "section": "electronics",
-        "items": [
-            {
-                "sku": "LAPTOP001",
-                "name": "Gaming Laptop",
-                "quantity": 5,
-                "location": "Aisle-A-Shelf-2",
-                "verification_method": "barcode_scan",
-                "confidence": 0.95,
-                "unit_price": 999.99
-            },
-            {
-                "sku": "PHONE001", 
-                "name": "Smartphone",
-                "quantity": 12,
-                "location": "Aisle-A-Shelf-1",
-                "verification_method": "visual_inspection",
-                "confidence": 0.88,
-                "unit_price": 599.99
-            }
-        ],
-        "total_items_scanned": 17,
-        "verification_duration": "00:15:30",
-        "anomalies": [],
-        "verification_notes": "Standard evening inventory check completed successfully"
-    }
-
-def test_ipfs_integration():
-    """Test IPFS integration with sample data"""
-    print("🧪 Testing IPFS Integration")
-    print("=" * 40)
-    
-    client = IPFSClient()
-    
-    # Test connection
-    info = client.get_ipfs_info()
-    print(f"IPFS Status: {info['status']}")
-    print(f"Message: {info.get('message', 'N/A')}")
-    
-    if info.get("status") == "connected":
-        print("✅ Real IPFS node connected")
-    elif info.get("status") == "mock_mode":
-        print("🎭 Running in mock mode (generating realistic hashes)")
-    else:
-        print("⚠️  IPFS not available")
-    
-    # Create sample PoA package
-    inventory_data = create_sample_inventory_data()
-    poa_package = client.create_poa_package(
-        submission_id="test_submission_001",
-        studio_id="kirana_ai_poc",
-        worker_agent_id="wa_test_001",
-        action_type="KiranaAI_StockReport",
-        inventory_data=inventory_data
-    )
-    
-    print(f"\n📦 Created PoA package:")
-    print(f"  Package Hash: {poa_package['package_hash']}")
-    print(f"  Submission ID: {poa_package['submission_id']}")
-    print(f"  Items Scanned: {poa_package['inventory_data']['total_items_scanned']}")
-    
-    # Upload to IPFS (or mock)
-    ipfs_hash = client.upload_poa_package(poa_package)
-    if ipfs_hash:
-        print(f"\n✅ Upload successful!")
-        print(f"  IPFS Hash: {ipfs_hash}")
-        
-        if not client.mock_mode:
-            # Try to retrieve and verify (only if real IPFS)
-            retrieved = client.retrieve_poa_package(ipfs_hash)
-            if retrieved:
-                print(f"✅ Successfully retrieved and verified package")
-                print(f"  Verified Submission ID: {retrieved['submission_id']}")
-                print(f"  Verified Items: {retrieved['inventory_data']['total_items_scanned']}")
-            else:
-                print("❌ Failed to retrieve package")
-        else:
-            print("🎭 Mock mode: Retrieval not tested (would need real IPFS)")
-    else:
-        print("❌ Upload failed completely")
-    
-    # Test evidence file upload simulation
-    print(f"\n🗂️  Testing evidence file upload...")
-    evidence_hash = client.upload_evidence_file("/mock/evidence/photo_001.jpg")
-    if evidence_hash:
-        print(f"✅ Evidence file hash: {evidence_hash}")
-    
-    print("\n🏁 IPFS integration test completed!")
-
-if __name__ == "__main__":
-    # Configure logging
-    logging.basicConfig(level=logging.INFO)
-    
-    # Run test
-    test_ipfs_integration() 
\ No newline at end of file
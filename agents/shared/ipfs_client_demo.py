@@ -0,0 +1,120 @@
+"""
+IPFS client demo for ChaosChain DVN PoC
+Sample data and an end-to-end check of IPFSClient, kept out of the library module
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from agents.shared.ipfs_client import IPFSClient
+
+# Example usage and testing functions
+def create_sample_inventory_data(timestamp: Optional[str] = None) -> Dict[str, Any]:
+    """Create sample inventory data for testing"""
+    if not timestamp:
+        timestamp = datetime.now(timezone.utc).isoformat()
+    
+    return {
+        "store_id": "store_123",
+        "scan_timestamp": timestamp,
+        "section": "electronics",
+        "items": [
+            {
+                "sku": "LAPTOP001",
+                "name": "Gaming Laptop",
+                "quantity": 5,
+                "location": "Aisle-A-Shelf-2",
+                "verification_method": "barcode_scan",
+                "confidence": 0.95,
+                "unit_price": 999.99
+            },
+            {
+                "sku": "PHONE001", 
+                "name": "Smartphone",
+                "quantity": 12,
+                "location": "Aisle-A-Shelf-1",
+                "verification_method": "visual_inspection",
+                "confidence": 0.88,
+                "unit_price": 599.99
+            }
+        ],
+        "total_items_scanned": 17,
+        "verification_duration": "00:15:30",
+        "anomalies": [],
+        "verification_notes": "Standard evening inventory check completed successfully"
+    }
+
+def test_ipfs_integration():
+    """Test IPFS integration with sample data"""
+    print("🧪 Testing IPFS Integration")
+    print("=" * 40)
+    
+    client = IPFSClient()
+    
+    # Test connection
+    info = client.get_ipfs_info()
+    print(f"IPFS Status: {info['status']}")
+    print(f"Message: {info.get('message', 'N/A')}")
+    
+    if info.get("status") == "connected":
+        print("✅ Real IPFS node connected")
+    elif info.get("status") == "mock_mode":
+        print("🎭 Running in mock mode (generating realistic hashes)")
+    else:
+        print("⚠️  IPFS not available")
+    
+    # Create sample PoA package
+    inventory_data = create_sample_inventory_data()
+    poa_package = client.create_poa_package(
+        submission_id="test_submission_001",
+        studio_id="kirana_ai_poc",
+        worker_agent_id="wa_test_001",
+        action_type="KiranaAI_StockReport",
+        inventory_data=inventory_data
+    )
+    
+    print(f"\n📦 Created PoA package:")
+    print(f"  Package Hash: {poa_package['package_hash']}")
+    print(f"  Submission ID: {poa_package['submission_id']}")
+    print(f"  Items Scanned: {poa_package['inventory_data']['total_items_scanned']}")
+    
+    # Upload to IPFS (or mock)
+    ipfs_hash = client.upload_poa_package(poa_package)
+    if ipfs_hash:
+        print(f"\n✅ Upload successful!")
+        print(f"  IPFS Hash: {ipfs_hash}")
+        
+        if not client.mock_mode:
+            # Try to retrieve and verify (only if real IPFS)
+            retrieved = client.retrieve_poa_package(ipfs_hash)
+            if retrieved:
+                print(f"✅ Successfully retrieved and verified package")
+                print(f"  Verified Submission ID: {retrieved['submission_id']}")
+                print(f"  Verified Items: {retrieved['inventory_data']['total_items_scanned']}")
+            else:
+                print("❌ Failed to retrieve package")
+        else:
+            print("🎭 Mock mode: Retrieval not tested (would need real IPFS)")
+    else:
+        print("❌ Upload failed completely")
+    
+    # Test evidence file upload simulation
+    print(f"\n🗂️  Testing evidence file upload...")
+    evidence_hash = client.upload_evidence_file("/mock/evidence/photo_001.jpg")
+    if evidence_hash:
+        print(f"✅ Evidence file hash: {evidence_hash}")
+    
+    print("\n🏁 IPFS integration test completed!")
+
+if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(level=logging.INFO)
+    
+    # Run test
+    test_ipfs_integration() 
\ No newline at end of file
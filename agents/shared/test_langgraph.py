@@ -3,78 +3,99 @@ Test script to verify LangGraph installation and basic functionality
 """
 
 import os
+import sys
+import time
+import asyncio
 import logging
-from typing import Dict, Any
-from langgraph.graph import StateGraph
-from langgraph.prebuilt import create_react_agent
-from datetime import datetime
+import operator
+import functools
+from dataclasses import dataclass
+from typing import Dict, Any, List
+from typing_extensions import Annotated, TypedDict
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (node tracing is DEBUG-only, so it stays silent by default)
+logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
-def test_basic_langgraph():
+@functools.lru_cache(maxsize=None)
+def _compile_linear_graph(state_schema, nodes):
+    """
+    Build and compile a linear StateGraph, memoized by its structure
+    
+    nodes is a tuple of (name, callable) pairs executed in order, so graphs with the
+    same schema, nodes and order share one compiled graph.
+    """
+    graph = StateGraph(state_schema)
+    for name, node in nodes:
+        graph.add_node(name, node)
+    
+    # Chain the nodes in order
+    for (source, _), (target, _) in zip(nodes, nodes[1:]):
+        graph.add_edge(source, target)
+    
+    graph.set_entry_point(nodes[0][0])
+    graph.set_finish_point(nodes[-1][0])
+    
+    # Throwaway test graphs never replay state, so skip checkpointing and debug tracing
+    return graph.compile(checkpointer=None, debug=False)
+
+# Define the state schema
+class AgentState(TypedDict):
+    input: str
+    status: str
+    timestamp: str
+    processed: bool
+    result: str
+
+# Create a simple graph workflow
+def start_node(state: AgentState) -> AgentState:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Starting workflow")
+    return {
+        "status": "started", 
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+    }
+
+def process_node(state: AgentState) -> AgentState:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Processing data")
+    return {
+        "processed": True, 
+        "result": "LangGraph is working!"
+    }
+
+def end_node(state: AgentState) -> AgentState:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Workflow complete")
+    return {"status": "completed"}
+
+BASIC_GRAPH_NODES = (
+    ("start", start_node),
+    ("process", process_node),
+    ("end", end_node)
+)
+
+# Initial state template, copied per run
+BASIC_INITIAL_STATE = {
+    "input": "test",
+    "status": "",
+    "timestamp": "",
+    "processed": False,
+    "result": ""
+}
+
+async def test_basic_langgraph():
     """Test basic LangGraph functionality without LLM"""
     print("🧪 Testing basic LangGraph functionality...")
     
     try:
-        # Define the state schema
-        from typing_extensions import TypedDict
-        
-        class AgentState(TypedDict):
-            input: str
-            status: str
-            timestamp: str
-            processed: bool
-            result: str
-        
-        # Create a simple graph workflow
-        def start_node(state: AgentState) -> AgentState:
-            print("  📍 Starting workflow...")
-            return {
-                **state,
-                "status": "started", 
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        
-        def process_node(state: AgentState) -> AgentState:
-            print("  ⚙️  Processing data...")
-            return {
-                **state, 
-                "processed": True, 
-                "result": "LangGraph is working!"
-            }
-        
-        def end_node(state: AgentState) -> AgentState:
-            print("  ✅ Workflow complete!")
-            return {**state, "status": "completed"}
-        
-        # Create graph using StateGraph
-        graph = StateGraph(AgentState)
-        graph.add_node("start", start_node)
-        graph.add_node("process", process_node)  
-        graph.add_node("end", end_node)
-        
-        # Add edges
-        graph.add_edge("start", "process")
-        graph.add_edge("process", "end")
-        
-        # Set entry point
-        graph.set_entry_point("start")
-        graph.set_finish_point("end")
-        
-        # Compile and run
-        compiled_graph = graph.compile()
+        compiled_graph = _compile_linear_graph(AgentState, BASIC_GRAPH_NODES)
         
         # Execute workflow
-        initial_state = {
-            "input": "test",
-            "status": "",
-            "timestamp": "",
-            "processed": False,
-            "result": ""
-        }
-        final_state = compiled_graph.invoke(initial_state)
+        initial_state = BASIC_INITIAL_STATE.copy()
+        final_state = await compiled_graph.ainvoke(initial_state)
         
         print(f"  📊 Final state: {final_state}")
         print("✅ Basic LangGraph test passed!")
@@ -85,42 +106,47 @@ def test_basic_langgraph():
         logger.exception("Detailed error:")
         return False
 
-def test_agent_creation():
+# Check once whether we have an API key for actual LLM testing
+_ANTHROPIC_KEY = os.getenv('ANTHROPIC_API_KEY')
+_HAS_LLM_KEY = bool(_ANTHROPIC_KEY) and _ANTHROPIC_KEY != 'your_anthropic_api_key_here'
+
+async def test_agent_creation():
     """Test LangGraph agent creation (without LLM calls)"""
     print("\n🤖 Testing LangGraph agent creation...")
     
+    if not _HAS_LLM_KEY:
+        print("  ⚠️  No valid API keys found - skipping LLM agent test")
+        print("  💡 Set ANTHROPIC_API_KEY or OPENAI_API_KEY in .env to test with real LLMs")
+        print("✅ Agent creation test completed!")
+        return True
+    
     try:
         # Create a simple tool for testing
         def get_inventory_count(store_id: str) -> str:
             """Get inventory count for a store (simulated)"""
             return f"Store {store_id} has 150 items in inventory"
         
-        # Check if we have API keys for actual LLM testing
-        anthropic_key = os.getenv('ANTHROPIC_API_KEY')
-        openai_key = os.getenv('OPENAI_API_KEY')
-        
-        if anthropic_key and anthropic_key != 'your_anthropic_api_key_here':
-            print("  🔑 Found Anthropic API key - creating real agent...")
-            try:
-                agent = create_react_agent(
-                    model="anthropic:claude-3-7-sonnet-latest",
-                    tools=[get_inventory_count],
-                    prompt="You are a helpful inventory assistant"
-                )
-                print("  ✅ Agent created successfully with Anthropic!")
-                
-                # Test a simple invocation
-                response = agent.invoke({
-                    "messages": [{"role": "user", "content": "What is the inventory count for store_123?"}]
-                })
-                print(f"  💬 Agent response: {response['messages'][-1]['content'][:100]}...")
-                
-            except Exception as e:
-                print(f"  ⚠️  Agent creation with LLM failed: {e}")
-                print("  🔧 This is likely due to API key or network issues")
-        else:
-            print("  ⚠️  No valid API keys found - skipping LLM agent test")
-            print("  💡 Set ANTHROPIC_API_KEY or OPENAI_API_KEY in .env to test with real LLMs")
+        print("  🔑 Found Anthropic API key - creating real agent...")
+        try:
+            # Imported here so the non-LLM tests don't pay for the LangChain stack
+            from langgraph.prebuilt import create_react_agent
+            
+            agent = create_react_agent(
+                model="anthropic:claude-3-7-sonnet-latest",
+                tools=[get_inventory_count],
+                prompt="You are a helpful inventory assistant"
+            )
+            print("  ✅ Agent created successfully with Anthropic!")
+            
+            # Test a simple invocation
+            response = await agent.ainvoke({
+                "messages": [{"role": "user", "content": "What is the inventory count for store_123?"}]
+            })
+            print(f"  💬 Agent response: {response['messages'][-1]['content'][:100]}...")
+            
+        except Exception as e:
+            print(f"  ⚠️  Agent creation with LLM failed: {e}")
+            print("  🔧 This is likely due to API key or network issues")
         
         print("✅ Agent creation test completed!")
         return True
@@ -130,88 +156,92 @@ def test_agent_creation():
         logger.exception("Detailed error:")
         return False
 
-def test_dvn_agent_simulation():
+# Define state for DVN workflow (slotted dataclass: attribute access, no per-state __dict__)
+@dataclass(slots=True)
+class DVNAgentState:
+    store_id: str = "store_123"
+    section: str = ""
+    agent_id: str = ""
+    scan_completed: bool = False
+    items_found: int = 0
+    scan_duration: str = ""
+    poa_created: bool = False
+    package_hash: str = ""
+    ipfs_hash: str = ""
+    submitted: bool = False
+    tx_hash: str = ""
+    submission_id: int = 0
+
+# Simulate a Worker Agent workflow
+def scan_inventory(state: DVNAgentState) -> Dict[str, Any]:
+    store_id = state.store_id
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Scanning inventory for %s", store_id)
+    return {
+        "scan_completed": True,
+        "items_found": 42,
+        "scan_duration": "00:15:30"
+    }
+
+def create_poa_package(state: DVNAgentState) -> Dict[str, Any]:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Creating PoA package")
+    return {
+        "poa_created": True,
+        "package_hash": "0x1234567890abcdef",
+        "ipfs_hash": "QmYwAPJzv5CZsnA"
+    }
+
+def submit_to_blockchain(state: DVNAgentState) -> Dict[str, Any]:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Submitting to blockchain")
+    return {
+        "submitted": True,
+        "tx_hash": "0xabcdef1234567890",
+        "submission_id": 1001
+    }
+
+def run_worker_pipeline(state: DVNAgentState) -> Dict[str, Any]:
+    """Run scan -> create_poa -> submit in a single node"""
+    # The stages neither branch nor checkpoint in between, so one superstep does it all
+    return {
+        **scan_inventory(state),
+        **create_poa_package(state),
+        **submit_to_blockchain(state)
+    }
+
+# Worker Agent workflow, fused into one node
+DVN_GRAPH_NODES = (
+    ("worker_pipeline", run_worker_pipeline),
+)
+
+# Initial state template, copied per run
+DVN_INITIAL_STATE = {
+    "store_id": "store_123",
+    "section": "electronics",
+    "agent_id": "wa_demo_001",
+    "scan_completed": False,
+    "items_found": 0,
+    "scan_duration": "",
+    "poa_created": False,
+    "package_hash": "",
+    "ipfs_hash": "",
+    "submitted": False,
+    "tx_hash": "",
+    "submission_id": 0
+}
+
+async def test_dvn_agent_simulation():
     """Simulate a simple DVN agent workflow"""
     print("\n🔗 Testing DVN agent workflow simulation...")
     
     try:
-        from typing_extensions import TypedDict
-        
-        # Define state for DVN workflow
-        class DVNAgentState(TypedDict):
-            store_id: str
-            section: str
-            agent_id: str
-            scan_completed: bool
-            items_found: int
-            scan_duration: str
-            poa_created: bool
-            package_hash: str
-            ipfs_hash: str
-            submitted: bool
-            tx_hash: str
-            submission_id: int
-        
-        # Simulate a Worker Agent workflow
-        def scan_inventory(state: DVNAgentState) -> DVNAgentState:
-            store_id = state.get("store_id", "store_123")
-            print(f"  📦 Scanning inventory for {store_id}...")
-            return {
-                **state,
-                "scan_completed": True,
-                "items_found": 42,
-                "scan_duration": "00:15:30"
-            }
-        
-        def create_poa_package(state: DVNAgentState) -> DVNAgentState:
-            print("  📄 Creating PoA package...")
-            return {
-                **state,
-                "poa_created": True,
-                "package_hash": "0x1234567890abcdef",
-                "ipfs_hash": "QmYwAPJzv5CZsnA"
-            }
-        
-        def submit_to_blockchain(state: DVNAgentState) -> DVNAgentState:
-            print("  ⛓️  Submitting to blockchain...")
-            return {
-                **state,
-                "submitted": True,
-                "tx_hash": "0xabcdef1234567890",
-                "submission_id": 1001
-            }
-        
-        # Create Worker Agent workflow
-        worker_graph = StateGraph(DVNAgentState)
-        worker_graph.add_node("scan", scan_inventory)
-        worker_graph.add_node("create_poa", create_poa_package)
-        worker_graph.add_node("submit", submit_to_blockchain)
-        
-        worker_graph.add_edge("scan", "create_poa")
-        worker_graph.add_edge("create_poa", "submit")
-        worker_graph.set_entry_point("scan")
-        worker_graph.set_finish_point("submit")
-        
-        # Compile and run
-        worker_agent = worker_graph.compile()
+        worker_agent = _compile_linear_graph(DVNAgentState, DVN_GRAPH_NODES)
         
         # Execute workflow
-        initial_state = {
-            "store_id": "store_123",
-            "section": "electronics",
-            "agent_id": "wa_demo_001",
-            "scan_completed": False,
-            "items_found": 0,
-            "scan_duration": "",
-            "poa_created": False,
-            "package_hash": "",
-            "ipfs_hash": "",
-            "submitted": False,
-            "tx_hash": "",
-            "submission_id": 0
-        }
+        initial_state = DVN_INITIAL_STATE.copy()
         
-        final_state = worker_agent.invoke(initial_state)
+        final_state = await worker_agent.ainvoke(initial_state)
         
         print(f"  🏁 Worker Agent completed: Submission ID {final_state.get('submission_id')}")
         print("✅ DVN agent workflow simulation passed!")
@@ -222,6 +252,41 @@ def test_dvn_agent_simulation():
         logger.exception("Detailed error:")
         return False
 
+# Suite graph: fan out to every test in one superstep and collect the results
+class SuiteState(TypedDict):
+    results: Annotated[List[bool], operator.add]
+
+def _suite_node(test):
+    """Wrap a test coroutine as a suite graph node that appends its result"""
+    async def run_test(state: SuiteState) -> Dict[str, Any]:
+        return {"results": [await test() is True]}
+    return run_test
+
+@functools.lru_cache(maxsize=None)
+def _build_suite_graph(tests):
+    """Build and compile the fan-out graph that runs tests as parallel branches"""
+    graph = StateGraph(SuiteState)
+    for test in tests:
+        graph.add_node(test.__name__, _suite_node(test))
+        graph.add_edge(test.__name__, END)
+    
+    def fan_out(state: SuiteState) -> List[Send]:
+        return [Send(test.__name__, state) for test in tests]
+    
+    graph.add_conditional_edges(START, fan_out, [test.__name__ for test in tests])
+    return graph.compile(checkpointer=None, debug=False)
+
+async def _run_tests(tests):
+    """Run the independent tests concurrently"""
+    try:
+        final_state = await _build_suite_graph(tuple(tests)).ainvoke({"results": []})
+        return final_state["results"]
+    except Exception as e:
+        # Report a suite failure rather than re-running tests that may already have run
+        print(f"❌ Test suite graph failed: {e}")
+        logger.exception("Detailed error:")
+        return [False] * len(tests)
+
 def main():
     """Run all LangGraph tests"""
     print("🧪 LangGraph Integration Test Suite")
@@ -233,12 +298,11 @@ def main():
         test_dvn_agent_simulation
     ]
     
-    passed = 0
     total = len(tests)
     
-    for test in tests:
-        if test():
-            passed += 1
+    # The tests are independent, so the LLM round-trip no longer blocks the others
+    results = asyncio.run(_run_tests(tests))
+    passed = sum(result is True for result in results)
     
     print("\n" + "=" * 50)
     print(f"🏆 Test Results: {passed}/{total} tests passed")
@@ -252,4 +316,9 @@ def main():
 
 if __name__ == "__main__":
     success = main()
-    exit(0 if success else 1) 
\ No newline at end of file
+    code = 0 if success else 1
+    # Under CI skip interpreter teardown; note os._exit runs no atexit handlers
+    if os.environ.get('CI'):
+        sys.stdout.flush()
+        os._exit(code)
+    sys.exit(code)
@@ -5,10 +5,17 @@ Evaluates PoA submissions from Worker Agents and submits attestations
 
 import os
 import sys
-import json
+import atexit
+import copy
+import hashlib
 import logging
+import functools
 import random
+import secrets
+import threading
 import time
+import weakref
+from collections import OrderedDict, namedtuple
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from typing_extensions import TypedDict
@@ -23,7 +30,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from agents.shared.constants import *
 from agents.shared.ipfs_client import IPFSClient
 from web3 import Web3
+from eth_abi import encode as abi_encode
 from eth_account import Account
+import numpy as np
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +45,134 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fixed ABI schema for attestation signing (EIP-712 style: type hash + typed fields)
+ATTESTATION_TYPE = (
+    "Attestation(address verifier,string verifierAgentId,string specialization,"
+    "uint256 overallScore,uint256 evaluationConfidence,bool structureValid,"
+    "uint256 contentQualityScore,uint256 evidenceQualityScore,string[] evaluationNotes,"
+    "string evaluationTimestamp,string decisionReason)"
+)
+ATTESTATION_TYPEHASH = Web3.keccak(text=ATTESTATION_TYPE)
+ATTESTATION_ABI_TYPES = [
+    "bytes32", "address", "string", "string", "uint256", "uint256", "bool",
+    "uint256", "uint256", "string[]", "string", "string"
+]
+SCORE_SCALE = 10**6  # Scores are signed as fixed-point integers with 6 decimals
+
+# Evaluation parameters; a namedtuple so the hot path reads fields by attribute, not dict probes
+EvalConfig = namedtuple(
+    "EvalConfig",
+    "structure_weight content_weight evidence_weight min_approval_threshold confidence_threshold "
+    "required_fields high_value_item_threshold anomaly_detection_weight",
+    defaults=((), None, 0.0)
+)
+
+BASE_EVALUATION_CONFIG = EvalConfig(
+    structure_weight=0.3,
+    content_weight=0.4,
+    evidence_weight=0.3,
+    min_approval_threshold=0.7,
+    confidence_threshold=0.8
+)
+
+# Specialized configurations
+EVALUATION_CONFIGS = {
+    "electronics": BASE_EVALUATION_CONFIG._replace(
+        content_weight=0.5,  # Electronics specialists focus more on content
+        required_fields=("sku", "quantity", "location", "verification_method"),
+        high_value_item_threshold=50000  # INR
+    ),
+    "inventory": BASE_EVALUATION_CONFIG._replace(
+        evidence_weight=0.4,  # Inventory specialists focus on evidence
+        structure_weight=0.4,
+        anomaly_detection_weight=0.2
+    ),
+    "general": BASE_EVALUATION_CONFIG
+}
+
+# Required PoA package fields, hoisted so evaluation doesn't rebuild them per submission
+REQUIRED_TOP_FIELDS = ("submission_id", "studio_id", "timestamp", "worker_agent_id",
+                       "action_type", "inventory_data", "evidence", "package_hash")
+REQUIRED_TOP_FIELDS_SET = frozenset(REQUIRED_TOP_FIELDS)
+TOP_FIELD_WEIGHT = 1.0 / len(REQUIRED_TOP_FIELDS)
+REQUIRED_INVENTORY_FIELDS = ("store_id", "scan_timestamp", "items", "total_items_scanned")
+REQUIRED_EVIDENCE = frozenset(VERIFIER_AGENT_DEFAULTS["required_evidence_types"])
+REQUIRED_EVIDENCE_COUNT = len(REQUIRED_EVIDENCE)
+MIN_SCAN_CONFIDENCE = VERIFIER_AGENT_DEFAULTS["min_confidence_threshold"]
+
+# Inventory items are scored as namedtuples rather than dicts; fields absent from the
+# item dict are _MISSING (a present field may legitimately hold None)
+_MISSING = object()
+Item = namedtuple(
+    "Item",
+    "sku name quantity location verification_method confidence unit_price",
+    defaults=(_MISSING,) * 7
+)
+REQUIRED_ITEM_COUNT = 6  # The first six Item fields are required
+ITEM_FIELD_WEIGHT = 1.0 / REQUIRED_ITEM_COUNT
+
+VECTORIZE_MIN_ITEMS = 64  # Below this, per-item Python scoring beats array setup
+
+IPFS_CACHE_SIZE = 1024  # PoA packages kept per agent; CIDs are immutable so entries never go stale
+ATTESTATION_BATCH_SIZE = 32  # Attestations per batch transaction
+ATTESTATION_BATCH_WAIT_MS = 500  # Flush a partial batch once its oldest entry is this old
+RESULT_CACHE_SIZE = 4096  # Completed evaluations kept per agent for duplicate submissions
+MOCK_POOL_SIZE = 64  # Prebuilt mock PoA package skeletons per agent
+
+# Choice pools for simulated data, as tuples so they are built once
+MOCK_ACTION_TYPES = tuple(SUPPORTED_ACTION_TYPES)
+MOCK_SECTIONS = ("electronics", "smartphones", "accessories")
+MOCK_AISLES = ("A", "B", "C")
+MOCK_VERIFICATION_METHODS = tuple(WORKER_AGENT_DEFAULTS["verification_methods"])
+
+# ISO timestamp memoized for the current second: [epoch second, formatted string]
+_iso_cache = [-1, ""]
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string, formatted at most once per second"""
+    second = int(time.time())
+    if second != _iso_cache[0]:
+        _iso_cache[1] = datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+        _iso_cache[0] = second
+    return _iso_cache[1]
+
+def _to_items(raw_items: List[Any]) -> List[Item]:
+    """Convert item dicts (or existing Item records) to Item records for scoring"""
+    return [
+        item if isinstance(item, Item) else Item._make(item.get(field, _MISSING) for field in Item._fields)
+        for item in raw_items
+    ]
+
+def _present_fields(item: Item) -> int:
+    """Number of required fields present on an item"""
+    return REQUIRED_ITEM_COUNT - item[:REQUIRED_ITEM_COUNT].count(_MISSING)
+
+def _field(value: Any, default: Any) -> Any:
+    """Item field value, or default if the field was absent"""
+    return default if value is _MISSING else value
+
+def _pkg_hash(submission_id: str) -> str:
+    """Deterministic 64-hex-char mock package hash for a submission"""
+    return hashlib.blake2b(submission_id.encode(), digest_size=32).hexdigest()
+
+def attestation_digest(verifier_address: str, evidence: Dict[str, Any]) -> bytes:
+    """Compute the keccak digest of attestation evidence over the fixed ABI schema"""
+    packed = abi_encode(ATTESTATION_ABI_TYPES, (
+        ATTESTATION_TYPEHASH,
+        verifier_address,
+        evidence["verifier_agent_id"],
+        evidence["specialization"],
+        int(evidence["overall_score"] * SCORE_SCALE),
+        int(evidence["evaluation_confidence"] * SCORE_SCALE),
+        evidence["structure_valid"],
+        int(evidence["content_quality_score"] * SCORE_SCALE),
+        int(evidence["evidence_quality_score"] * SCORE_SCALE),
+        list(evidence["evaluation_notes"]),
+        evidence["evaluation_timestamp"],
+        evidence["decision_reason"]
+    ))
+    return Web3.keccak(packed)
+
 class VerifierAgentState(TypedDict):
     """State schema for Verifier Agent workflow"""
     # Input parameters
@@ -73,12 +210,287 @@ class VerifierAgentState(TypedDict):
     started_at: str
     completed_at: str
 
+# Workflow nodes: defined once at import and bound to an agent with functools.partial
+
+def initialize_evaluation(agent: "VerifierAgent", state: VerifierAgentState) -> Dict[str, Any]:
+    """Initialize the evaluation process"""
+    logger.info("🔍 Starting evaluation of submission %s", state['submission_id'])
+    
+    return {
+        "current_step": "fetching_submission",
+        "status": "evaluating",
+        "evaluation_completed": False,
+        "started_at": _now_iso()
+    }
+
+def fetch_submission_data(agent: "VerifierAgent", state: VerifierAgentState) -> Dict[str, Any]:
+    """Fetch submission data from blockchain and IPFS"""
+    submission_id = state["submission_id"]
+    
+    # Submission data already fetched by the caller (see VerifierAgent.fetch_submission) is used as is
+    if state["poa_package"]:
+        return {"current_step": "evaluating_package"}
+    
+    logger.info("📥 Fetching submission data for %s", submission_id)
+    
+    # For PoC, simulate fetching from blockchain
+    # In real implementation, this would query the actual contracts
+    mock_submission = {
+        "submission_id": submission_id,
+        "worker_agent": f"wa_{agent._rng.randint(1000, 9999)}",
+        "studio_id": STUDIO_ID,
+        "ipfs_hash": f"Qm{hashlib.blake2b(submission_id.encode(), digest_size=3).hexdigest()}{'a' * 40}",
+        "package_hash": _pkg_hash(submission_id),
+        "timestamp": _now_iso(),
+        "status": "pending_attestation"
+    }
+    
+    # Try to fetch PoA package from IPFS
+    poa_package = None
+    if not agent.ipfs_client.mock_mode:
+        poa_package = agent._fetch_poa_package(mock_submission["ipfs_hash"])
+    
+    if not poa_package:
+        # Generate realistic mock PoA package for evaluation
+        poa_package = agent._generate_mock_poa_package(submission_id)
+        logger.info("🎭 Using mock PoA package for evaluation")
+    
+    return {
+        "current_step": "evaluating_package",
+        "submission_data": mock_submission,
+        "poa_package": poa_package,
+        "ipfs_hash": mock_submission["ipfs_hash"],
+        "package_hash": mock_submission["package_hash"]
+    }
+
+def evaluate_package(agent: "VerifierAgent", state: VerifierAgentState) -> Dict[str, Any]:
+    """Evaluate structure, content quality and evidence quality in a single pass"""
+    logger.info("🔍 Evaluating PoA package structure, content and evidence...")
+    
+    poa_package = state["poa_package"]
+    evaluation_notes = []
+    
+    # Structure: required top-level fields, then required inventory fields
+    present_top = REQUIRED_TOP_FIELDS_SET & poa_package.keys()
+    structure_score = len(present_top) * TOP_FIELD_WEIGHT
+    
+    if len(present_top) < len(REQUIRED_TOP_FIELDS):
+        missing_fields = [field for field in REQUIRED_TOP_FIELDS if field not in present_top]
+        evaluation_notes.append(f"Missing required fields: {', '.join(missing_fields)}")
+    
+    inventory_data = poa_package.get("inventory_data", {})
+    if "inventory_data" in poa_package:
+        for field in REQUIRED_INVENTORY_FIELDS:
+            if field not in inventory_data:
+                structure_score *= 0.9  # Reduce score for missing inventory fields
+                evaluation_notes.append(f"Missing inventory field: {field}")
+    
+    structure_valid = structure_score >= 0.8
+    
+    logger.info("📋 Structure evaluation: %s (score: %.2f)", "VALID" if structure_valid else "INVALID", structure_score)
+    
+    # Content: per-item quality, anomaly rate and scan confidence
+    # Items stay dicts in the package; they are converted to Item records only for scoring
+    items = _to_items(inventory_data.get("items", []))
+    
+    if not items:
+        evaluation_notes.append("No items found in inventory data")
+        content_score = 0.0
+    else:
+        content_score = agent._score_items(items)
+        
+        # Check for anomalies and consistency
+        anomalies = inventory_data.get("anomalies", [])
+        if len(anomalies) > len(items) * 0.3:  # More than 30% anomalies
+            content_score *= 0.8
+            evaluation_notes.append("High anomaly rate detected")
+        
+        # Check scan confidence
+        scan_confidence = inventory_data.get("scan_confidence", 0.0)
+        if scan_confidence < MIN_SCAN_CONFIDENCE:
+            content_score *= 0.9
+            evaluation_notes.append(f"Low scan confidence: {scan_confidence:.2f}")
+    
+    logger.info("📊 Content quality score: %.2f", content_score)
+    
+    # Evidence: required evidence types plus bonuses for additional evidence
+    evidence = poa_package.get("evidence", {})
+    
+    # Evidence types are matched as keys, top-level or one level down, never by scanning values
+    evidence_keys = evidence.keys() | {key for value in evidence.values() if isinstance(value, dict) for key in value}
+    evidence_score = len(REQUIRED_EVIDENCE & evidence_keys) / REQUIRED_EVIDENCE_COUNT
+    
+    if "verification_method" in evidence:
+        evidence_score += 0.1
+    
+    if "agent_id" in evidence:
+        evidence_score += 0.1
+    
+    evidence_score = min(1.0, evidence_score)  # Cap at 1.0
+    
+    logger.info("🗂️ Evidence quality score: %.2f", evidence_score)
+    
+    return {
+        "current_step": "calculating_final_score",
+        "structure_valid": structure_valid,
+        "content_quality_score": content_score,
+        "evidence_quality_score": evidence_score,
+        "evaluation_notes": evaluation_notes
+    }
+
+def calculate_final_evaluation(agent: "VerifierAgent", state: VerifierAgentState) -> Dict[str, Any]:
+    """Calculate final evaluation score and make attestation decision"""
+    logger.info("🎯 Calculating final evaluation...")
+    
+    # Get scores
+    structure_score = 1.0 if state.get("structure_valid", False) else 0.0
+    content_score = state.get("content_quality_score", 0.0)
+    evidence_score = state.get("evidence_quality_score", 0.0)
+    
+    # Calculate weighted overall score
+    config = agent.evaluation_config
+    overall_score = (
+        structure_score * config.structure_weight +
+        content_score * config.content_weight +
+        evidence_score * config.evidence_weight
+    )
+    
+    # Determine attestation decision
+    attestation_decision = overall_score >= config.min_approval_threshold
+    
+    # Calculate confidence (based on score consistency and specialization match)
+    score_variance = abs(structure_score - content_score) + abs(content_score - evidence_score)
+    confidence = max(0.5, 1.0 - (score_variance / 2.0))
+    
+    logger.info("🎯 Final evaluation: %.2f -> %s", overall_score, "APPROVE" if attestation_decision else "REJECT")
+    
+    return {
+        "current_step": "creating_attestation",
+        "overall_score": overall_score,
+        "evaluation_confidence": confidence,
+        "attestation_decision": attestation_decision,
+        "evaluation_completed": True
+    }
+
+def create_and_submit_attestation(agent: "VerifierAgent", state: VerifierAgentState) -> Dict[str, Any]:
+    """Create cryptographic attestation and submit to blockchain"""
+    logger.info("✍️ Creating and submitting attestation...")
+    
+    # Create attestation evidence
+    attestation_evidence = {
+        "verifier_agent_id": agent.agent_id,
+        "specialization": agent.specialization,
+        "overall_score": state["overall_score"],
+        "evaluation_confidence": state["evaluation_confidence"],
+        "structure_valid": state.get("structure_valid", False),
+        "content_quality_score": state.get("content_quality_score", 0.0),
+        "evidence_quality_score": state.get("evidence_quality_score", 0.0),
+        "evaluation_notes": state.get("evaluation_notes", []),
+        "evaluation_timestamp": _now_iso(),
+        "decision_reason": agent._generate_decision_reason(state)
+    }
+    
+    try:
+        if agent.simulation_mode:
+            # Simulate attestation signing
+            logger.info("🎭 Simulation mode: generating mock attestation submission")
+            signature = secrets.token_bytes(65)
+        else:
+            # Real blockchain submission would go here
+            # For now, simulate since we don't have contract ABIs loaded
+            logger.info("⛓️ Submitting attestation to blockchain...")
+            
+            # Sign the typed digest of the attestation evidence
+            digest = attestation_digest(agent.account.address, attestation_evidence)
+            signature = agent.account.signHash(digest).signature
+        
+        if agent.batch_attestations:
+            # Sent with a later batch transaction, whose hash is then recorded in
+            # agent.attestation_tx_hashes; until then the attestation is only queued
+            agent.queue_attestation(state["submission_id"], signature)
+            logger.info("📥 Attestation queued for batch submission")
+            
+            return {
+                "current_step": "attestation_queued",
+                "status": "queued",
+                "attestation_evidence": attestation_evidence,
+                "attestation_signature": "0x" + bytes(signature).hex(),
+                "completed_at": _now_iso()
+            }
+        
+        # Simulate transaction
+        tx_hash = "0x" + secrets.token_hex(32)
+        gas_used = agent._rng.randint(200000, 300000)
+        
+        logger.info("✅ Attestation submitted: %s", tx_hash)
+        
+        return {
+            "current_step": "completed",
+            "status": "completed",
+            "attestation_evidence": attestation_evidence,
+            "attestation_signature": "0x" + bytes(signature).hex(),
+            "tx_hash": tx_hash,
+            "gas_used": gas_used,
+            "completed_at": _now_iso()
+        }
+    
+    except Exception as e:
+        logger.error("❌ Attestation submission failed: %s", e)
+        return {
+            "current_step": "failed",
+            "status": "failed",
+            "error_message": str(e),
+            "completed_at": _now_iso()
+        }
+
+# Node order of the (linear) verifier workflow
+WORKFLOW_NODES = (
+    ("initialize", initialize_evaluation),
+    ("fetch_data", fetch_submission_data),
+    ("evaluate", evaluate_package),
+    ("final_eval", calculate_final_evaluation),
+    ("submit_attestation", create_and_submit_attestation)
+)
+
+# Agents with batching enabled; held weakly so registering does not keep them alive
+_BATCHING_AGENTS: "weakref.WeakSet[VerifierAgent]" = weakref.WeakSet()
+
+@atexit.register
+def _close_batching_agents() -> None:
+    """Submit the attestations still queued by live batching agents at interpreter exit"""
+    for agent in list(_BATCHING_AGENTS):
+        agent.close()
+
 class VerifierAgent:
     """
     DVN Verifier Agent that evaluates PoA submissions and submits attestations
     """
     
-    def __init__(self, private_key: str = None, agent_id: str = None, specialization: str = "general"):
+    # Connections shared by all verifier agents in the process, keyed by endpoint
+    _W3_POOL: Dict[str, Web3] = {}
+    _IPFS_POOL: Dict[str, IPFSClient] = {}
+    
+    @classmethod
+    def _get_w3(cls, rpc_url: str) -> Web3:
+        """Get the shared Web3 instance for an RPC URL, reusing its HTTP session"""
+        w3 = cls._W3_POOL.get(rpc_url)
+        if w3 is None:
+            w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 10}))
+            cls._W3_POOL[rpc_url] = w3
+        return w3
+    
+    @classmethod
+    def _get_ipfs_client(cls, ipfs_url: str) -> IPFSClient:
+        """Get the shared IPFS client for a node URL"""
+        ipfs_client = cls._IPFS_POOL.get(ipfs_url)
+        if ipfs_client is None:
+            ipfs_client = IPFSClient(ipfs_url)
+            cls._IPFS_POOL[ipfs_url] = ipfs_client
+        return ipfs_client
+    
+    def __init__(self, private_key: str = None, agent_id: str = None, specialization: str = "general",
+                 batch_attestations: bool = False, ipfs_client: Optional[IPFSClient] = None,
+                 web3_client: Optional[Web3] = None):
         """
         Initialize Verifier Agent
         
@@ -86,9 +498,16 @@ class VerifierAgent:
             private_key: Private key for blockchain transactions
             agent_id: Unique identifier for this verifier agent
             specialization: Agent specialization (general, electronics, inventory, etc.)
+            batch_attestations: Queue signed attestations and submit them in batch transactions
+                (results report status "queued"; see attestation_tx_hashes and close)
+            ipfs_client: IPFS client to use instead of the pooled one for IPFS_NODE_URL
+            web3_client: Web3 connection to use instead of the pooled one for SEPOLIA_RPC_URL
         """
+        # Per-agent RNG for simulated data (avoids sharing the module-level generator)
+        self._rng = random.Random()
+        
         self.private_key = private_key or os.getenv('VERIFIER_PRIVATE_KEY')
-        self.agent_id = agent_id or os.getenv('VERIFIER_AGENT_ID', f'va_{specialization}_{random.randint(1000, 9999)}')
+        self.agent_id = agent_id or os.getenv('VERIFIER_AGENT_ID', f'va_{specialization}_{self._rng.randint(1000, 9999)}')
         self.specialization = specialization
         
         # Check if we should run in simulation mode
@@ -104,426 +523,258 @@ class VerifierAgent:
             try:
                 self.account = Account.from_key(self.private_key)
             except Exception as e:
-                logger.warning(f"Invalid private key format: {e} - enabling simulation mode")
+                logger.warning("Invalid private key format: %s - enabling simulation mode", e)
                 self.simulation_mode = True
                 self.account = None
         
-        # Initialize Web3 connection
-        self.w3 = Web3(Web3.HTTPProvider(SEPOLIA_RPC_URL))
-        
-        # Initialize IPFS client
-        self.ipfs_client = IPFSClient()
+        # Web3 connection and IPFS client, unless given, are created on first use (see the properties below)
+        self._w3 = web3_client
+        self._ipfs_client = ipfs_client
         
         # Initialize contract addresses
         self.attestation_address = CONTRACT_ADDRESSES["dvn_attestation"]
         self.studio_address = CONTRACT_ADDRESSES["studio_poc"]
         
+        # Signed attestations waiting for a batch transaction: (submission id bytes32, signature)
+        # (submission_id, signature) pairs, flushed when full, on a timer and at close/exit
+        self.batch_attestations = batch_attestations
+        self._pending: List[Tuple[str, bytes]] = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Batch transaction hash of each flushed submission
+        self.attestation_tx_hashes: Dict[str, str] = {}
+        if batch_attestations:
+            _BATCHING_AGENTS.add(self)
+        
         # Set evaluation parameters based on specialization
         self.evaluation_config = self._get_evaluation_config()
         
-        logger.info(f"Verifier Agent {self.agent_id} ({specialization}) initialized (simulation_mode={self.simulation_mode})")
-    
-    def _get_evaluation_config(self) -> Dict[str, Any]:
-        """Get evaluation configuration based on agent specialization"""
-        base_config = {
-            "structure_weight": 0.3,
-            "content_weight": 0.4,
-            "evidence_weight": 0.3,
-            "min_approval_threshold": 0.7,
-            "confidence_threshold": 0.8
-        }
+        # Run nodes as a plain pipeline unless the LangGraph workflow is requested (e.g. for tracing)
+        self.fast_path = VERIFIER_FAST_PATH
         
-        # Specialized configurations
-        specialization_configs = {
-            "electronics": {
-                **base_config,
-                "content_weight": 0.5,  # Electronics specialists focus more on content
-                "required_fields": ["sku", "quantity", "location", "verification_method"],
-                "high_value_item_threshold": 50000  # INR
-            },
-            "inventory": {
-                **base_config,
-                "evidence_weight": 0.4,  # Inventory specialists focus on evidence
-                "structure_weight": 0.4,
-                "anomaly_detection_weight": 0.2
-            },
-            "general": base_config
-        }
+        # Compiled LangGraph workflow, built on first evaluation
+        self._compiled_workflow = None
+        
+        # LRU cache of PoA packages fetched from IPFS, keyed by ipfs_hash
+        self._ipfs_cache: OrderedDict = OrderedDict()
+        
+        # LRU cache of completed or queued evaluations, keyed by (submission_id, package_hash)
+        self._result_cache: OrderedDict = OrderedDict()
         
-        return specialization_configs.get(self.specialization, base_config)
+        # Mock PoA package skeletons, built on first use
+        self._mock_pool = None
+        
+        logger.info("Verifier Agent %s (%s) initialized (simulation_mode=%s)", self.agent_id, specialization, self.simulation_mode)
+    
+    @property
+    def w3(self) -> Web3:
+        """Web3 connection, shared with other agents using the same RPC URL"""
+        if self._w3 is None:
+            self._w3 = self._get_w3(SEPOLIA_RPC_URL)
+        return self._w3
+    
+    @property
+    def ipfs_client(self) -> IPFSClient:
+        """IPFS client, shared with other agents using the same node"""
+        if self._ipfs_client is None:
+            self._ipfs_client = self._get_ipfs_client(IPFS_NODE_URL)
+        return self._ipfs_client
+    
+    def _get_evaluation_config(self) -> EvalConfig:
+        """Get evaluation configuration based on agent specialization"""
+        return EVALUATION_CONFIGS.get(self.specialization, BASE_EVALUATION_CONFIG)
     
     def create_workflow(self) -> StateGraph:
         """Create the Verifier Agent LangGraph workflow"""
+        # Create the workflow graph
+        workflow = StateGraph(VerifierAgentState)
         
-        def initialize_evaluation(state: VerifierAgentState) -> VerifierAgentState:
-            """Initialize the evaluation process"""
-            logger.info(f"🔍 Starting evaluation of submission {state['submission_id']}")
-            
-            return {
-                **state,
-                "current_step": "fetching_submission",
-                "status": "evaluating",
-                "evaluation_completed": False,
-                "started_at": datetime.now(timezone.utc).isoformat()
-            }
+        # Add nodes (module-level node functions bound to this agent)
+        for name, node in WORKFLOW_NODES:
+            workflow.add_node(name, functools.partial(node, self))
         
-        def fetch_submission_data(state: VerifierAgentState) -> VerifierAgentState:
-            """Fetch submission data from blockchain and IPFS"""
-            submission_id = state["submission_id"]
-            
-            logger.info(f"📥 Fetching submission data for {submission_id}")
-            
-            # For PoC, simulate fetching from blockchain
-            # In real implementation, this would query the actual contracts
-            mock_submission = {
-                "submission_id": submission_id,
-                "worker_agent": f"wa_{random.randint(1000, 9999)}",
-                "studio_id": STUDIO_ID,
-                "ipfs_hash": f"Qm{hash(submission_id) % 1000000:06d}{'a' * 40}",
-                "package_hash": f"{hash(submission_id):064x}"[:64],
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "status": "pending_attestation"
-            }
-            
-            # Try to fetch PoA package from IPFS
-            poa_package = None
-            if not self.ipfs_client.mock_mode:
-                poa_package = self.ipfs_client.retrieve_poa_package(mock_submission["ipfs_hash"])
-            
-            if not poa_package:
-                # Generate realistic mock PoA package for evaluation
-                poa_package = self._generate_mock_poa_package(submission_id)
-                logger.info(f"🎭 Using mock PoA package for evaluation")
-            
-            return {
-                **state,
-                "current_step": "evaluating_structure",
-                "submission_data": mock_submission,
-                "poa_package": poa_package,
-                "ipfs_hash": mock_submission["ipfs_hash"],
-                "package_hash": mock_submission["package_hash"]
-            }
+        # Add edges
+        for (source, _), (target, _) in zip(WORKFLOW_NODES, WORKFLOW_NODES[1:]):
+            workflow.add_edge(source, target)
         
-        def evaluate_structure(state: VerifierAgentState) -> VerifierAgentState:
-            """Evaluate the structure and format of the PoA package"""
-            logger.info("🔍 Evaluating PoA package structure...")
-            
-            poa_package = state["poa_package"]
-            evaluation_notes = []
-            
-            # Check required fields
-            required_fields = ["submission_id", "studio_id", "timestamp", "worker_agent_id", 
-                             "action_type", "inventory_data", "evidence", "package_hash"]
-            
-            structure_score = 0.0
-            missing_fields = []
-            
-            for field in required_fields:
-                if field in poa_package:
-                    structure_score += 1.0 / len(required_fields)
-                else:
-                    missing_fields.append(field)
-            
-            if missing_fields:
-                evaluation_notes.append(f"Missing required fields: {', '.join(missing_fields)}")
-            
-            # Validate inventory data structure
-            if "inventory_data" in poa_package:
-                inventory = poa_package["inventory_data"]
-                required_inventory_fields = ["store_id", "scan_timestamp", "items", "total_items_scanned"]
-                
-                for field in required_inventory_fields:
-                    if field not in inventory:
-                        structure_score *= 0.9  # Reduce score for missing inventory fields
-                        evaluation_notes.append(f"Missing inventory field: {field}")
-            
-            structure_valid = structure_score >= 0.8
-            
-            logger.info(f"📋 Structure evaluation: {'VALID' if structure_valid else 'INVALID'} (score: {structure_score:.2f})")
-            
-            return {
-                **state,
-                "current_step": "evaluating_content",
-                "structure_valid": structure_valid,
-                "evaluation_notes": evaluation_notes
-            }
+        # Set entry and exit points
+        workflow.set_entry_point(WORKFLOW_NODES[0][0])
+        workflow.set_finish_point(WORKFLOW_NODES[-1][0])
         
-        def evaluate_content_quality(state: VerifierAgentState) -> VerifierAgentState:
-            """Evaluate the quality and validity of the content"""
-            logger.info("📊 Evaluating content quality...")
-            
-            poa_package = state["poa_package"]
-            evaluation_notes = state["evaluation_notes"]
-            
-            content_score = 0.0
-            inventory_data = poa_package.get("inventory_data", {})
-            items = inventory_data.get("items", [])
-            
-            if not items:
-                evaluation_notes.append("No items found in inventory data")
-                content_score = 0.0
-            else:
-                # Evaluate items quality
-                item_scores = []
-                
-                for item in items:
-                    item_score = self._evaluate_single_item(item)
-                    item_scores.append(item_score)
-                
-                content_score = sum(item_scores) / len(item_scores) if item_scores else 0.0
-                
-                # Check for anomalies and consistency
-                anomalies = inventory_data.get("anomalies", [])
-                if len(anomalies) > len(items) * 0.3:  # More than 30% anomalies
-                    content_score *= 0.8
-                    evaluation_notes.append("High anomaly rate detected")
-                
-                # Check scan confidence
-                scan_confidence = inventory_data.get("scan_confidence", 0.0)
-                if scan_confidence < VERIFIER_AGENT_DEFAULTS["min_confidence_threshold"]:
-                    content_score *= 0.9
-                    evaluation_notes.append(f"Low scan confidence: {scan_confidence:.2f}")
-            
-            logger.info(f"📊 Content quality score: {content_score:.2f}")
-            
-            return {
-                **state,
-                "current_step": "evaluating_evidence",
-                "content_quality_score": content_score,
-                "evaluation_notes": evaluation_notes
-            }
+        return workflow
+    
+    def queue_attestation(self, submission_id: str, signature: bytes) -> None:
+        """Queue a signed attestation, flushing when the batch is full or has waited too long"""
+        with self._pending_lock:
+            if not self._pending:
+                # The oldest entry waits at most ATTESTATION_BATCH_WAIT_MS for the batch to fill
+                self._flush_timer = threading.Timer(ATTESTATION_BATCH_WAIT_MS / 1000, self.flush_batch)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            self._pending.append((submission_id, bytes(signature)))
+            full = len(self._pending) >= ATTESTATION_BATCH_SIZE
         
-        def evaluate_evidence_quality(state: VerifierAgentState) -> VerifierAgentState:
-            """Evaluate the quality of supporting evidence"""
-            logger.info("🗂️ Evaluating evidence quality...")
-            
-            poa_package = state["poa_package"]
-            evaluation_notes = state["evaluation_notes"]
-            
-            evidence = poa_package.get("evidence", {})
-            evidence_score = 0.0
-            
-            # Check for required evidence types
-            required_evidence = VERIFIER_AGENT_DEFAULTS["required_evidence_types"]
-            evidence_present = 0
-            
-            for evidence_type in required_evidence:
-                if evidence_type in evidence or any(evidence_type in str(v) for v in evidence.values()):
-                    evidence_present += 1
-            
-            evidence_score = evidence_present / len(required_evidence)
-            
-            # Bonus for additional evidence
-            if "verification_method" in evidence:
-                evidence_score += 0.1
-            
-            if "agent_id" in evidence:
-                evidence_score += 0.1
-            
-            evidence_score = min(1.0, evidence_score)  # Cap at 1.0
-            
-            logger.info(f"🗂️ Evidence quality score: {evidence_score:.2f}")
-            
-            return {
-                **state,
-                "current_step": "calculating_final_score",
-                "evidence_quality_score": evidence_score,
-                "evaluation_notes": evaluation_notes
-            }
+        if full:
+            self.flush_batch()
+    
+    def flush_batch(self, max_batch: int = ATTESTATION_BATCH_SIZE) -> List[str]:
+        """
+        Submit all pending attestations, up to max_batch per transaction
         
-        def calculate_final_evaluation(state: VerifierAgentState) -> VerifierAgentState:
-            """Calculate final evaluation score and make attestation decision"""
-            logger.info("🎯 Calculating final evaluation...")
-            
-            # Get scores
-            structure_score = 1.0 if state.get("structure_valid", False) else 0.0
-            content_score = state.get("content_quality_score", 0.0)
-            evidence_score = state.get("evidence_quality_score", 0.0)
-            
-            # Calculate weighted overall score
-            config = self.evaluation_config
-            overall_score = (
-                structure_score * config["structure_weight"] +
-                content_score * config["content_weight"] +
-                evidence_score * config["evidence_weight"]
-            )
-            
-            # Determine attestation decision
-            attestation_decision = overall_score >= config["min_approval_threshold"]
-            
-            # Calculate confidence (based on score consistency and specialization match)
-            score_variance = abs(structure_score - content_score) + abs(content_score - evidence_score)
-            confidence = max(0.5, 1.0 - (score_variance / 2.0))
-            
-            logger.info(f"🎯 Final evaluation: {overall_score:.2f} -> {'APPROVE' if attestation_decision else 'REJECT'}")
-            
-            return {
-                **state,
-                "current_step": "creating_attestation",
-                "overall_score": overall_score,
-                "evaluation_confidence": confidence,
-                "attestation_decision": attestation_decision,
-                "evaluation_completed": True
-            }
+        Each submission's batch transaction hash is recorded in attestation_tx_hashes.
         
-        def create_and_submit_attestation(state: VerifierAgentState) -> VerifierAgentState:
-            """Create cryptographic attestation and submit to blockchain"""
-            logger.info("✍️ Creating and submitting attestation...")
-            
-            # Create attestation evidence
-            attestation_evidence = {
-                "verifier_agent_id": self.agent_id,
-                "specialization": self.specialization,
-                "overall_score": state["overall_score"],
-                "evaluation_confidence": state["evaluation_confidence"],
-                "structure_valid": state.get("structure_valid", False),
-                "content_quality_score": state.get("content_quality_score", 0.0),
-                "evidence_quality_score": state.get("evidence_quality_score", 0.0),
-                "evaluation_notes": state.get("evaluation_notes", []),
-                "evaluation_timestamp": datetime.now(timezone.utc).isoformat(),
-                "decision_reason": self._generate_decision_reason(state)
-            }
-            
-            if self.simulation_mode:
-                # Simulate attestation submission
-                logger.info("🎭 Simulation mode: generating mock attestation submission")
-                
-                mock_signature = f"0x{''.join(random.choices('0123456789abcdef', k=130))}"
-                tx_hash = f"0x{''.join(random.choices('0123456789abcdef', k=64))}"
-                gas_used = random.randint(200000, 300000)
-                
-                return {
-                    **state,
-                    "current_step": "completed",
-                    "status": "completed",
-                    "attestation_evidence": attestation_evidence,
-                    "attestation_signature": mock_signature,
-                    "tx_hash": tx_hash,
-                    "gas_used": gas_used,
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }
-            
-            try:
-                # Real blockchain submission would go here
-                # For now, simulate since we don't have contract ABIs loaded
-                
-                logger.info("⛓️ Submitting attestation to blockchain...")
-                
-                # Create message to sign
-                message = json.dumps(attestation_evidence, sort_keys=True)
-                signature = self.account.signHash(Web3.keccak(text=message))
-                
-                # Simulate transaction
-                tx_hash = f"0x{''.join(random.choices('0123456789abcdef', k=64))}"
-                gas_used = random.randint(200000, 300000)
-                
-                logger.info(f"✅ Attestation submitted: {tx_hash}")
-                
-                return {
-                    **state,
-                    "current_step": "completed",
-                    "status": "completed",
-                    "attestation_evidence": attestation_evidence,
-                    "attestation_signature": signature.signature.hex(),
-                    "tx_hash": tx_hash,
-                    "gas_used": gas_used,
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-            except Exception as e:
-                logger.error(f"❌ Attestation submission failed: {e}")
-                return {
-                    **state,
-                    "current_step": "failed",
-                    "status": "failed",
-                    "error_message": str(e),
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }
+        Returns:
+            Transaction hash of each submitted batch
+        """
+        with self._pending_lock:
+            # One attestation per submission goes on-chain: the latest one queued for it
+            pending = list(dict(self._pending).items())
+            self._pending.clear()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
         
-        # Create the workflow graph
-        workflow = StateGraph(VerifierAgentState)
+        tx_hashes = []
+        for start in range(0, len(pending), max_batch):
+            batch = pending[start:start + max_batch]
+            ids = [Web3.keccak(text=submission_id) for submission_id, _ in batch]
+            
+            # Real submission would call DvnAttestation.submitBatch(ids, signatures) here
+            # For now, simulate since we don't have contract ABIs loaded
+            tx_hash = "0x" + secrets.token_hex(32)
+            logger.info("✅ Attestation batch of %d submitted: %s", len(ids), tx_hash)
+            tx_hashes.append(tx_hash)
+            
+            for submission_id, _ in batch:
+                self.attestation_tx_hashes[submission_id] = tx_hash
         
-        # Add nodes
-        workflow.add_node("initialize", initialize_evaluation)
-        workflow.add_node("fetch_data", fetch_submission_data)
-        workflow.add_node("eval_structure", evaluate_structure)
-        workflow.add_node("eval_content", evaluate_content_quality)
-        workflow.add_node("eval_evidence", evaluate_evidence_quality)
-        workflow.add_node("final_eval", calculate_final_evaluation)
-        workflow.add_node("submit_attestation", create_and_submit_attestation)
+        return tx_hashes
+    
+    def close(self) -> None:
+        """Submit any attestations still queued; called automatically at interpreter exit"""
+        if self._pending:
+            self.flush_batch()
+    
+    def _fetch_poa_package(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a PoA package from IPFS, reusing previously fetched content"""
+        poa_package = self._ipfs_cache.get(ipfs_hash)
+        if poa_package is not None:
+            self._ipfs_cache.move_to_end(ipfs_hash)
+            return poa_package
         
-        # Add edges
-        workflow.add_edge("initialize", "fetch_data")
-        workflow.add_edge("fetch_data", "eval_structure")
-        workflow.add_edge("eval_structure", "eval_content")
-        workflow.add_edge("eval_content", "eval_evidence")
-        workflow.add_edge("eval_evidence", "final_eval")
-        workflow.add_edge("final_eval", "submit_attestation")
+        poa_package = self.ipfs_client.retrieve_poa_package(ipfs_hash)
+        if poa_package:
+            self._ipfs_cache[ipfs_hash] = poa_package
+            if len(self._ipfs_cache) > IPFS_CACHE_SIZE:
+                self._ipfs_cache.popitem(last=False)
         
-        # Set entry and exit points
-        workflow.set_entry_point("initialize")
-        workflow.set_finish_point("submit_attestation")
+        return poa_package
+    
+    def _score_items(self, items: List[Item]) -> float:
+        """Mean item quality score, vectorized with NumPy for large item lists"""
+        if len(items) < VECTORIZE_MIN_ITEMS:
+            return sum(map(self._evaluate_single_item, items)) / len(items)
         
-        return workflow
+        count = len(items)
+        present = np.fromiter((_present_fields(item) for item in items),
+                              dtype=np.float64, count=count)
+        confidence = np.fromiter((_field(item.confidence, 0.0) for item in items),
+                                 dtype=np.float64, count=count)
+        quantity = np.fromiter((_field(item.quantity, 0) for item in items),
+                               dtype=np.float64, count=count)
+        
+        # Same rules as _evaluate_single_item, applied to every item at once
+        scores = present * ITEM_FIELD_WEIGHT
+        scores += np.where(confidence >= 0.9, 0.1, 0.0)
+        scores -= np.where(confidence < 0.7, 0.1, 0.0)
+        scores += np.where((quantity >= 0) & (quantity <= 1000), 0.05, 0.0)
+        
+        return float(np.clip(scores, 0.0, 1.0).mean())
     
-    def _evaluate_single_item(self, item: Dict[str, Any]) -> float:
+    def _evaluate_single_item(self, item: Item) -> float:
         """Evaluate a single inventory item"""
-        score = 0.0
-        
         # Check required fields
-        required_fields = ["sku", "name", "quantity", "location", "verification_method", "confidence"]
-        for field in required_fields:
-            if field in item:
-                score += 1.0 / len(required_fields)
+        score = _present_fields(item) * ITEM_FIELD_WEIGHT
         
         # Check confidence level
-        confidence = item.get("confidence", 0.0)
+        confidence = _field(item.confidence, 0.0)
         if confidence >= 0.9:
             score += 0.1
         elif confidence < 0.7:
             score -= 0.1
         
         # Check for reasonable quantity
-        quantity = item.get("quantity", 0)
+        quantity = _field(item.quantity, 0)
         if 0 <= quantity <= 1000:  # Reasonable range
             score += 0.05
         
         return max(0.0, min(1.0, score))
     
-    def _generate_mock_poa_package(self, submission_id: str) -> Dict[str, Any]:
-        """Generate a realistic mock PoA package for evaluation"""
+    def _build_mock_skeleton(self) -> Dict[str, Any]:
+        """Build a random mock PoA package without the per-submission fields"""
+        rng = self._rng
+        item_count = rng.randint(1, 5)
+        
+        # Draw the per-item categorical fields in one batch each
+        aisles = rng.choices(MOCK_AISLES, k=item_count)
+        methods = rng.choices(MOCK_VERIFICATION_METHODS, k=item_count)
+        
         return {
-            "submission_id": submission_id,
+            "submission_id": "",
             "studio_id": STUDIO_ID,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "worker_agent_id": f"wa_{random.randint(1000, 9999)}",
-            "action_type": random.choice(SUPPORTED_ACTION_TYPES),
+            "timestamp": "",
+            "worker_agent_id": f"wa_{rng.randint(1000, 9999)}",
+            "action_type": rng.choice(MOCK_ACTION_TYPES),
             "inventory_data": {
-                "store_id": f"store_{random.randint(100, 999)}",
-                "scan_timestamp": datetime.now(timezone.utc).isoformat(),
-                "section": random.choice(["electronics", "smartphones", "accessories"]),
+                "store_id": f"store_{rng.randint(100, 999)}",
+                "scan_timestamp": "",
+                "section": rng.choice(MOCK_SECTIONS),
                 "items": [
                     {
                         "sku": f"ITEM{i:03d}",
                         "name": f"Test Item {i}",
-                        "quantity": random.randint(0, 50),
-                        "location": f"Aisle-{random.choice(['A', 'B', 'C'])}-Shelf-{random.randint(1, 5)}",
-                        "verification_method": random.choice(WORKER_AGENT_DEFAULTS["verification_methods"]),
-                        "confidence": random.uniform(0.7, 0.98),
-                        "unit_price": random.uniform(100, 50000)
+                        "quantity": rng.randint(0, 50),
+                        "location": f"Aisle-{aisles[i]}-Shelf-{rng.randint(1, 5)}",
+                        "verification_method": methods[i],
+                        "confidence": rng.uniform(0.7, 0.98),
+                        "unit_price": rng.uniform(100, 50000)
                     }
-                    for i in range(random.randint(1, 5))
+                    for i in range(item_count)
                 ],
-                "total_items_scanned": random.randint(1, 5),
-                "scan_confidence": random.uniform(0.8, 0.95),
+                "total_items_scanned": rng.randint(1, 5),
+                "scan_confidence": rng.uniform(0.8, 0.95),
                 "anomalies": []
             },
             "evidence": {
-                "scan_logs": f"log_{submission_id}",
-                "agent_id": f"wa_{random.randint(1000, 9999)}",
+                "scan_logs": "",
+                "agent_id": f"wa_{rng.randint(1000, 9999)}",
                 "verification_method": "automated"
             },
-            "package_hash": f"{hash(submission_id):064x}"[:64]
+            "package_hash": ""
+        }
+    
+    def _generate_mock_poa_package(self, submission_id: str) -> Dict[str, Any]:
+        """Generate a realistic mock PoA package for evaluation"""
+        # Skeletons are built once; each package patches only the per-submission fields
+        if self._mock_pool is None:
+            self._mock_pool = [self._build_mock_skeleton() for _ in range(MOCK_POOL_SIZE)]
+        skeleton = self._mock_pool[hash(submission_id) % MOCK_POOL_SIZE]
+        
+        # Every mutable part is copied, so changes to one package never reach the skeleton
+        inventory_data = skeleton["inventory_data"]
+        now = _now_iso()
+        return {
+            **skeleton,
+            "submission_id": submission_id,
+            "timestamp": now,
+            "inventory_data": {
+                **inventory_data,
+                "scan_timestamp": now,
+                "items": [dict(item) for item in inventory_data["items"]],
+                "anomalies": list(inventory_data["anomalies"])
+            },
+            "evidence": {**skeleton["evidence"], "scan_logs": f"log_{submission_id}"},
+            "package_hash": _pkg_hash(submission_id)
         }
     
     def _generate_decision_reason(self, state: VerifierAgentState) -> str:
@@ -545,24 +796,59 @@ class VerifierAgent:
             else:
                 return f"Submission quality score {score:.2f} below approval threshold"
     
-    def evaluate_submission(self, submission_id: str) -> Dict[str, Any]:
+    def fetch_submission(self, submission_id: str) -> Dict[str, Any]:
+        """
+        Fetch a submission's data once, to pass to evaluate_submission(payload=...)
+        
+        Args:
+            submission_id: Unique identifier for the submission to fetch
+            
+        Returns:
+            The submission's submission_data, poa_package, ipfs_hash and package_hash
+        """
+        fetched = fetch_submission_data(self, self._initial_state(submission_id))
+        del fetched["current_step"]
+        return fetched
+    
+    def evaluate_submission(self, submission_id: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Evaluate a PoA submission and submit attestation
         
         Args:
             submission_id: Unique identifier for the submission to evaluate
+            payload: Submission data from fetch_submission, e.g. shared by several
+                verifiers (fetched by the workflow if omitted)
             
         Returns:
             Final evaluation state
         """
-        logger.info(f"🚀 Starting evaluation of submission {submission_id}")
+        logger.info("🚀 Starting evaluation of submission %s", submission_id)
         
-        # Create and compile workflow
-        workflow = self.create_workflow()
-        compiled_workflow = workflow.compile()
+        # Duplicate submissions (retries, replayed events) reuse the earlier signed result
+        # The package hash is the one recorded for the submission (mocked from its id for the PoC)
+        package_hash = payload["package_hash"] if payload else _pkg_hash(submission_id)
+        cache_key = (submission_id, package_hash)
+        cached_state = self._result_cache.get(cache_key)
+        if cached_state is not None:
+            self._result_cache.move_to_end(cache_key)
+            logger.info("♻️ Reusing evaluation of submission %s", submission_id)
+            # Callers get their own copy, so mutating a result cannot corrupt the cache
+            # A queued attestation is already pending, so it is neither re-signed nor re-queued
+            result = copy.deepcopy(cached_state)
+            if not self.simulation_mode and result["status"] == "completed":
+                # The signed attestation is reused, but a real broadcast is a new transaction
+                # Simulated, since we don't have contract ABIs loaded
+                result["tx_hash"] = "0x" + secrets.token_hex(32)
+            return result
         
-        # Initialize state
-        initial_state: VerifierAgentState = {
+        initial_state = self._initial_state(submission_id)
+        if payload:
+            initial_state.update(payload)
+        return self._run_evaluation(initial_state, cache_key)
+    
+    def _initial_state(self, submission_id: str) -> VerifierAgentState:
+        """Build the initial workflow state for a submission"""
+        return {
             "submission_id": submission_id,
             "agent_id": self.agent_id,
             "current_step": "initializing",
@@ -587,38 +873,95 @@ class VerifierAgent:
             "started_at": "",
             "completed_at": ""
         }
-        
+    
+    def _run_evaluation(self, initial_state: VerifierAgentState, cache_key: Tuple[str, str]) -> Dict[str, Any]:
+        """Run the evaluation workflow from initial_state and cache a completed or queued result"""
         try:
-            # Execute workflow
-            final_state = compiled_workflow.invoke(initial_state)
+            if self.fast_path:
+                # Linear pipeline with no checkpointing or branching: call the nodes directly
+                final_state = dict(initial_state)
+                for _, node in WORKFLOW_NODES:
+                    final_state.update(node(self, final_state))
+            else:
+                # Build and compile the workflow once, then reuse it for every submission
+                if self._compiled_workflow is None:
+                    self._compiled_workflow = self.create_workflow().compile()
+                final_state = self._compiled_workflow.invoke(initial_state)
+            
+            logger.info("🏁 Evaluation completed with decision: %s", "APPROVE" if final_state['attestation_decision'] else "REJECT")
             
-            logger.info(f"🏁 Evaluation completed with decision: {'APPROVE' if final_state['attestation_decision'] else 'REJECT'}")
+            if final_state["status"] in ("completed", "queued"):
+                # Cache a private snapshot; the returned state may be mutated by the caller
+                self._result_cache[cache_key] = copy.deepcopy(final_state)
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
             
-            return final_state
+            return dict(final_state)
             
         except Exception as e:
-            logger.error(f"❌ Workflow execution failed: {e}")
+            logger.error("❌ Workflow execution failed: %s", e)
             return {
                 **initial_state,
                 "status": "failed",
                 "error_message": str(e),
-                "completed_at": datetime.now(timezone.utc).isoformat()
+                "completed_at": _now_iso()
             }
 
+def run_auto_mode(agent: VerifierAgent, submission_ids) -> bool:
+    """
+    Evaluate submissions as their IDs arrive, submitting attestations in batches
+    
+    Args:
+        agent: Verifier agent with batch_attestations enabled
+        submission_ids: Iterable of submission IDs, one per line (e.g. sys.stdin)
+        
+    Returns:
+        True if every submission was evaluated and its attestation submitted
+    """
+    print("🤖 Auto-evaluation mode: reading submission IDs from stdin")
+    
+    queued = []
+    failed = 0
+    try:
+        for line in submission_ids:
+            submission_id = line.strip()
+            if not submission_id:
+                continue
+            
+            result = agent.evaluate_submission(submission_id)
+            if result["status"] == "queued":
+                queued.append(submission_id)
+                decision = "APPROVE" if result["attestation_decision"] else "REJECT"
+                print(f"📥 {submission_id}: {decision} (score: {result['overall_score']:.2f}), attestation queued")
+            else:
+                failed += 1
+                print(f"❌ {submission_id}: FAILED - {result.get('error_message', 'Unknown error')}")
+    finally:
+        # Submit the last partial batch before exiting
+        agent.close()
+    
+    for submission_id in dict.fromkeys(queued):
+        print(f"⛓️ {submission_id}: batch transaction {agent.attestation_tx_hashes.get(submission_id, 'not submitted')}")
+    
+    return failed == 0 and all(submission_id in agent.attestation_tx_hashes for submission_id in queued)
+
 def main():
     """CLI interface for Verifier Agent"""
     import argparse
     
     parser = argparse.ArgumentParser(description="ChaosChain DVN Verifier Agent")
-    parser.add_argument("--submission-id", required=True, help="Submission ID to evaluate")
+    parser.add_argument("--submission-id", help="Submission ID to evaluate")
     parser.add_argument("--specialization", default="general", 
                        choices=["general", "electronics", "inventory"], 
                        help="Agent specialization")
     parser.add_argument("--agent-id", help="Custom agent ID")
     parser.add_argument("--private-key", help="Private key for blockchain transactions")
-    parser.add_argument("--auto-mode", action="store_true", help="Auto-evaluate mode (monitor for submissions)")
+    parser.add_argument("--auto-mode", action="store_true",
+                       help="Auto-evaluate mode: evaluate submission IDs read from stdin, one per line, batching attestations")
     
     args = parser.parse_args()
+    if not args.auto_mode and not args.submission_id:
+        parser.error("--submission-id is required unless --auto-mode is set")
     
     print("🔍 ChaosChain DVN Verifier Agent")
     print("=" * 60)
@@ -627,13 +970,12 @@ def main():
     agent = VerifierAgent(
         private_key=args.private_key,
         agent_id=args.agent_id,
-        specialization=args.specialization
+        specialization=args.specialization,
+        batch_attestations=args.auto_mode
     )
     
     if args.auto_mode:
-        print("🤖 Auto-evaluation mode not implemented yet")
-        print("Use --submission-id to evaluate specific submissions")
-        return False
+        return run_auto_mode(agent, sys.stdin)
     
     # Evaluate specific submission
     result = agent.evaluate_submission(args.submission_id)
@@ -0,0 +1,11 @@
+"""
+Importable alias for the Verifier Agent
+The agent lives in agents/verifier-agent/, which is not a valid module name, so import it from here:
+
+    from agents.verifier_agent import VerifierAgent
+"""
+
+from importlib import import_module
+
+# Imported once and cached in sys.modules, so repeat imports reuse the compiled module
+VerifierAgent = import_module("agents.verifier-agent.verifier_agent").VerifierAgent
@@ -1,22 +1,232 @@
 """
 Inventory Verification Utility for Worker Agent
 Provides realistic inventory scanning simulation with various scenarios
+
+Imports the shared package as agents.shared, so the project root must be on
+PYTHONPATH (activate-env.sh sets it).
 """
 
-import os
-import sys
-import random
+import functools
 import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
 
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+# Optional Numba JIT for the per-item scan arithmetic
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from agents.shared.constants import SAMPLE_INVENTORY_ITEMS, SAMPLE_STORES, WORKER_AGENT_DEFAULTS
 
 logger = logging.getLogger(__name__)
 
+# Scan arithmetic: turn base quantities and uniform [0, 1) draws into scanned quantities
+# and confidences. Draw rows: 0 stock variation, 1 confidence, 2 anomaly, 3 anomaly kind,
+# 4 low-confidence value. Anomalies are half forced out of stock, half forced to low confidence.
+def _scan_arrays_numpy(base_qty, draws, stock_min, stock_max, conf_min, conf_max,
+                       anomaly_probability, low_conf_max):
+    """Vectorized NumPy implementation of the scan arithmetic"""
+    variation = stock_min + (stock_max - stock_min) * draws[0]
+    confidence = conf_min + (conf_max - conf_min) * draws[1]
+    actual_qty = np.maximum(0, (base_qty * (1 + variation)).astype(np.int64))
+    
+    anomaly = draws[2] < anomaly_probability
+    out_of_stock = anomaly & (draws[3] < 0.5)
+    low_confidence = anomaly & ~out_of_stock
+    actual_qty[out_of_stock] = 0
+    confidence[low_confidence] = 0.5 + (low_conf_max - 0.5) * draws[4][low_confidence]
+    
+    return actual_qty, confidence
+
+if NUMBA_AVAILABLE:
+    # One kernel for every scenario: the bounds are arguments, so its on-disk cache holds
+    # a single compiled version whichever scenarios a run happens to use
+    @numba.njit(cache=True)
+    def _scan_arrays_numba(base_qty, draws, stock_min, stock_max, conf_min, conf_max,
+                           anomaly_probability, low_conf_max):
+        """JIT-compiled scan arithmetic, one fused loop over the items"""
+        n = base_qty.shape[0]
+        actual_qty = np.empty(n, dtype=np.int64)
+        confidence = np.empty(n, dtype=np.float64)
+        
+        for i in range(n):
+            qty = int(base_qty[i] * (1.0 + stock_min + (stock_max - stock_min) * draws[0, i]))
+            conf = conf_min + (conf_max - conf_min) * draws[1, i]
+            if draws[2, i] < anomaly_probability:
+                if draws[3, i] < 0.5:
+                    qty = 0
+                else:
+                    conf = 0.5 + (low_conf_max - 0.5) * draws[4, i]
+            actual_qty[i] = max(qty, 0)
+            confidence[i] = conf
+        
+        return actual_qty, confidence
+
+# Below this many items the JIT kernel's compile and dispatch cost outweighs the loop it saves
+NUMBA_MIN_ITEMS = 1024
+
+def _make_scan_fn(params: "ScenarioParams"):
+    """Build the scan arithmetic for one scenario, with its parameters bound"""
+    stock_min, stock_max, conf_min, conf_max, anomaly_probability, _ = params
+    
+    scan_numpy = functools.partial(_scan_arrays_numpy, stock_min=stock_min, stock_max=stock_max,
+                                   conf_min=conf_min, conf_max=conf_max,
+                                   anomaly_probability=anomaly_probability)
+    if not NUMBA_AVAILABLE:
+        return scan_numpy
+    
+    def scan(base_qty, draws, low_conf_max):
+        """Run small scans through NumPy so the kernel only compiles for large batches"""
+        if base_qty.shape[0] < NUMBA_MIN_ITEMS:
+            return scan_numpy(base_qty, draws, low_conf_max=low_conf_max)
+        return _scan_arrays_numba(base_qty, draws, stock_min, stock_max, conf_min, conf_max,
+                                  anomaly_probability, low_conf_max)
+    
+    return scan
+
+@dataclass(slots=True)
+class ScanAnalysis:
+    """Stock counts, total value and anomalies gathered in one pass over scanned items"""
+    total_value: float = 0.0
+    manual_check_count: int = 0
+    in_stock: int = 0
+    out_of_stock: int = 0
+    low_stock: int = 0
+    severity_counts: Dict[str, int] = field(default_factory=lambda: {"high": 0, "medium": 0, "low": 0})
+    anomalies: List[Dict[str, Any]] = field(default_factory=list)
+
+@dataclass(slots=True)
+class ScanBatch:
+    """Scanned items as columns: NumPy arrays for numeric fields, lists for strings"""
+    sku: List[str]
+    name: List[str]
+    category: List[str]
+    location: List[str]
+    verification_method: List[str]
+    quantity: np.ndarray
+    expected_quantity: np.ndarray
+    unit_price: np.ndarray
+    confidence: np.ndarray
+    requires_manual_check: np.ndarray
+    store_id: str = ""
+    scan_timestamp: str = ""
+    # (confidence_threshold, analysis) from the last _analyze call, reused while the threshold matches
+    _analysis: Optional[Tuple[float, ScanAnalysis]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __len__(self) -> int:
+        return len(self.sku)
+    
+    @property
+    def total_value(self) -> np.ndarray:
+        return self.quantity * self.unit_price
+    
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "ScanBatch":
+        """Build a batch from per-item scan records"""
+        n = len(items)
+        first = items[0] if items else {}
+        return cls(
+            sku=[item["sku"] for item in items],
+            name=[item["name"] for item in items],
+            category=[item["category"] for item in items],
+            location=[item["location"] for item in items],
+            verification_method=[item["verification_method"] for item in items],
+            quantity=np.fromiter((item["quantity"] for item in items), dtype=np.int64, count=n),
+            expected_quantity=np.fromiter((item["expected_quantity"] for item in items), dtype=np.int64, count=n),
+            unit_price=np.fromiter((item["unit_price"] for item in items), dtype=np.float64, count=n),
+            confidence=np.fromiter((item["confidence"] for item in items), dtype=np.float64, count=n),
+            requires_manual_check=np.fromiter((item["requires_manual_check"] for item in items), dtype=bool, count=n),
+            store_id=first.get("store_id", ""),
+            scan_timestamp=first.get("scan_timestamp", "")
+        )
+    
+    @classmethod
+    def coerce(cls, scanned_items: Union[List[Dict[str, Any]], "ScanBatch"]) -> "ScanBatch":
+        """Accept either a ScanBatch or a list of per-item scan records"""
+        return scanned_items if isinstance(scanned_items, cls) else cls.from_items(scanned_items)
+    
+    def to_items(self) -> List[Dict[str, Any]]:
+        """Materialize per-item scan records (tolist() yields native Python numbers)"""
+        return [
+            {
+                "sku": sku,
+                "name": name,
+                "category": category,
+                "quantity": qty,
+                "expected_quantity": base,
+                "quantity_variance": qty - base,
+                "unit_price": price,
+                "total_value": qty * price,
+                "location": location,
+                "verification_method": method,
+                "confidence": conf,
+                "scan_timestamp": self.scan_timestamp,
+                "store_id": self.store_id,
+                "barcode_readable": conf > 0.8,
+                "requires_manual_check": manual
+            }
+            for sku, name, category, location, method, qty, base, price, conf, manual in zip(
+                self.sku, self.name, self.category, self.location, self.verification_method,
+                self.quantity.tolist(), self.expected_quantity.tolist(), self.unit_price.tolist(),
+                self.confidence.tolist(), self.requires_manual_check.tolist()
+            )
+        ]
+
+# Every shelf location a scan can report (aisles A-D, shelves 1-6)
+LOCATIONS = tuple(f"Aisle-{aisle}-Shelf-{shelf}" for aisle in "ABCD" for shelf in range(1, 7))
+
+# Severity levels indexed by severity code, and the code of each anomaly type
+SEVERITY_LEVELS = ("low", "medium", "high")
+ANOMALY_TYPES = ("out_of_stock", "low_stock", "overstock", "low_confidence", "manual_check_required")
+ANOMALY_SEVERITY_CODES = np.array([2, 1, 0, 1, 1], dtype=np.intp)
+
+# Scenario parameters as a flat tuple
+ScenarioParams = namedtuple(
+    "ScenarioParams",
+    "stock_min stock_max conf_min conf_max anomaly_probability description"
+)
+
+def _build_category_index() -> Dict[str, List[int]]:
+    """Group sample item positions by lowercased category"""
+    index: Dict[str, List[int]] = {}
+    for position, item in enumerate(SAMPLE_INVENTORY_ITEMS):
+        index.setdefault(item["category"].lower(), []).append(position)
+    return index
+
+# Built once at import; section lookups then only walk the categories
+_CATEGORY_INDEX = _build_category_index()
+
+@functools.lru_cache(maxsize=256)
+def _items_for_section(section: str) -> Tuple[Dict[str, Any], ...]:
+    """Sample items whose category contains, or is contained in, the lowercased section"""
+    positions = sorted(
+        position
+        for category, category_positions in _CATEGORY_INDEX.items()
+        if section in category or category in section
+        for position in category_positions
+    )
+    return tuple(SAMPLE_INVENTORY_ITEMS[position] for position in positions)
+
+def _assess(avg_confidence: float, anomaly_ratio: float) -> str:
+    """Grade a scan from its average confidence and anomaly ratio"""
+    if avg_confidence >= 0.95 and anomaly_ratio <= 0.05:
+        return "excellent"
+    elif avg_confidence >= 0.85 and anomaly_ratio <= 0.15:
+        return "good"
+    elif avg_confidence >= 0.75 and anomaly_ratio <= 0.25:
+        return "acceptable"
+    elif avg_confidence >= 0.65 and anomaly_ratio <= 0.40:
+        return "poor"
+    else:
+        return "failed"
+
 class InventoryVerifier:
     """Simulates realistic inventory verification scenarios"""
     
@@ -54,10 +264,21 @@ class InventoryVerifier:
         }
     }
     
-    def __init__(self):
-        """Initialize the inventory verifier"""
+    # SCENARIOS flattened to tuples once, so scans unpack scalars instead of indexing dicts
+    _SCENARIOS_FAST = {
+        name: ScenarioParams(*config["stock_variation"], *config["confidence_range"],
+                             config["anomaly_probability"], config["description"])
+        for name, config in SCENARIOS.items()
+    }
+    
+    # Scan arithmetic specialized per scenario
+    _SCAN_FUNCS = {name: _make_scan_fn(params) for name, params in _SCENARIOS_FAST.items()}
+    
+    def __init__(self, seed: Optional[int] = None):
+        """Initialize the inventory verifier; pass a seed to make scans reproducible"""
         self.verification_methods = WORKER_AGENT_DEFAULTS["verification_methods"]
         self.confidence_threshold = WORKER_AGENT_DEFAULTS["confidence_threshold"]
+        self._rng = np.random.default_rng(seed)
     
     def scan_inventory(self, 
                       store_id: str, 
@@ -76,6 +297,19 @@ class InventoryVerifier:
         Returns:
             Tuple of (scanned_items, scan_metadata)
         """
+        batch, scan_metadata = self.scan_inventory_batch(store_id, section, scenario, custom_items)
+        return batch.to_items(), scan_metadata
+    
+    def scan_inventory_batch(self, 
+                            store_id: str, 
+                            section: str, 
+                            scenario: str = "normal",
+                            custom_items: List[Dict[str, Any]] = None) -> Tuple["ScanBatch", Dict[str, Any]]:
+        """
+        Simulate inventory scanning for a store section, keeping the result in columnar form
+        
+        Same as scan_inventory, but returns a ScanBatch instead of per-item dicts.
+        """
         logger.info(f"🔍 Starting {scenario} inventory scan for {store_id}/{section}")
         
         # Get scenario parameters
@@ -83,7 +317,7 @@ class InventoryVerifier:
             logger.warning(f"Unknown scenario '{scenario}', using 'normal'")
             scenario = "normal"
             
-        scenario_config = self.SCENARIOS[scenario]
+        params = self._SCENARIOS_FAST[scenario]
         
         # Get items to scan
         items_to_scan = custom_items or self._get_items_for_section(section)
@@ -92,112 +326,80 @@ class InventoryVerifier:
             logger.warning(f"No items found for section '{section}', using all sample items")
             items_to_scan = SAMPLE_INVENTORY_ITEMS
         
-        # Simulate scanning each item
-        scanned_items = []
-        anomaly_count = 0
-        total_confidence = 0
-        
-        for item_template in items_to_scan:
-            scanned_item = self._scan_single_item(item_template, scenario_config, store_id)
-            scanned_items.append(scanned_item)
-            
-            total_confidence += scanned_item["confidence"]
-            
-            # Count anomalies
-            if scanned_item["quantity"] == 0 or scanned_item["confidence"] < self.confidence_threshold:
-                anomaly_count += 1
+        # Simulate scanning all items at once; the whole scan shares one timestamp
+        scan_timestamp = datetime.now(timezone.utc).isoformat()
+        batch = self._scan_batch(items_to_scan, scenario, store_id, scan_timestamp)
+        item_count = len(batch)
         
-        # Calculate overall metrics
-        avg_confidence = total_confidence / len(scanned_items) if scanned_items else 0
+        # Calculate overall metrics (anomalies: out of stock or low confidence)
+        avg_confidence = float(batch.confidence.mean()) if item_count else 0
+        anomaly_count = int(np.count_nonzero((batch.quantity == 0) | (batch.confidence < self.confidence_threshold)))
         
         # Generate scan metadata
         scan_metadata = {
             "scenario": scenario,
-            "scenario_description": scenario_config["description"],
-            "total_items_scanned": len(scanned_items),
+            "scenario_description": params.description,
+            "total_items_scanned": item_count,
             "average_confidence": avg_confidence,
             "anomaly_count": anomaly_count,
-            "scan_duration": self._generate_scan_duration(len(scanned_items)),
-            "scan_timestamp": datetime.now(timezone.utc).isoformat(),
-            "verification_quality": self._assess_verification_quality(avg_confidence, anomaly_count, len(scanned_items))
+            "scan_duration": self._generate_scan_duration(item_count),
+            "scan_timestamp": scan_timestamp,
+            "verification_quality": self._assess_verification_quality(avg_confidence, anomaly_count, item_count)
         }
         
-        logger.info(f"✅ Scan completed: {len(scanned_items)} items, avg confidence: {avg_confidence:.2f}, anomalies: {anomaly_count}")
+        logger.info(f"✅ Scan completed: {item_count} items, avg confidence: {avg_confidence:.2f}, anomalies: {anomaly_count}")
         
-        return scanned_items, scan_metadata
+        return batch, scan_metadata
     
-    def _get_items_for_section(self, section: str) -> List[Dict[str, Any]]:
+    def _get_items_for_section(self, section: str) -> Tuple[Dict[str, Any], ...]:
         """Get items that match the specified section"""
-        matching_items = []
-        
-        for item in SAMPLE_INVENTORY_ITEMS:
-            # Check if section matches item category or is in the category
-            if (section.lower() in item["category"].lower() or 
-                item["category"].lower() in section.lower()):
-                matching_items.append(item)
-        
-        return matching_items
+        return _items_for_section(section.lower())
     
-    def _scan_single_item(self, 
-                         item_template: Dict[str, Any], 
-                         scenario_config: Dict[str, Any],
-                         store_id: str) -> Dict[str, Any]:
-        """Simulate scanning a single inventory item"""
-        
-        # Calculate quantity with scenario-based variation
-        base_qty = item_template["typical_quantity"]
-        stock_min, stock_max = scenario_config["stock_variation"]
-        variation = random.uniform(stock_min, stock_max)
-        actual_qty = max(0, int(base_qty * (1 + variation)))
-        
-        # Generate confidence based on scenario
-        conf_min, conf_max = scenario_config["confidence_range"]
-        confidence = random.uniform(conf_min, conf_max)
-        
-        # Occasionally introduce anomalies based on scenario
-        if random.random() < scenario_config["anomaly_probability"]:
-            if random.random() < 0.5:
-                # Force out of stock
-                actual_qty = 0
-            else:
-                # Force low confidence
-                confidence = random.uniform(0.5, self.confidence_threshold - 0.01)
-        
-        # Select verification method
-        verification_method = random.choice(self.verification_methods)
-        
-        # Generate location
-        location = f"Aisle-{random.choice(['A', 'B', 'C', 'D'])}-Shelf-{random.randint(1, 6)}"
-        
-        scanned_item = {
-            "sku": item_template["sku"],
-            "name": item_template["name"],
-            "category": item_template["category"],
-            "quantity": actual_qty,
-            "expected_quantity": base_qty,
-            "quantity_variance": actual_qty - base_qty,
-            "unit_price": item_template["unit_price"],
-            "total_value": actual_qty * item_template["unit_price"],
-            "location": location,
-            "verification_method": verification_method,
-            "confidence": confidence,
-            "scan_timestamp": datetime.now(timezone.utc).isoformat(),
-            "store_id": store_id,
-            "barcode_readable": confidence > 0.8,
-            "requires_manual_check": confidence < self.confidence_threshold or actual_qty == 0
-        }
-        
-        return scanned_item
+    def _scan_batch(self,
+                    item_templates: List[Dict[str, Any]],
+                    scenario: str,
+                    store_id: str,
+                    scan_timestamp: str) -> "ScanBatch":
+        """Simulate scanning a batch of inventory items, drawing all random values in bulk"""
+        rng = self._rng
+        n = len(item_templates)
+        base_qty = np.fromiter((t["typical_quantity"] for t in item_templates), dtype=np.int64, count=n)
+        
+        # Quantity and confidence with scenario-based variation and anomalies
+        draws = rng.random((5, n))
+        actual_qty, confidence = self._SCAN_FUNCS[scenario](
+            base_qty, draws, low_conf_max=self.confidence_threshold - 0.01
+        )
+        
+        # Verification method and location
+        methods = self.verification_methods
+        method_idx = rng.integers(0, len(methods), n)
+        location_idx = rng.integers(0, len(LOCATIONS), n)
+        
+        return ScanBatch(
+            sku=[t["sku"] for t in item_templates],
+            name=[t["name"] for t in item_templates],
+            category=[t["category"] for t in item_templates],
+            location=[LOCATIONS[i] for i in location_idx.tolist()],
+            verification_method=[methods[i] for i in method_idx.tolist()],
+            quantity=actual_qty,
+            expected_quantity=base_qty,
+            unit_price=np.fromiter((t["unit_price"] for t in item_templates), dtype=np.float64, count=n),
+            confidence=confidence,
+            requires_manual_check=(confidence < self.confidence_threshold) | (actual_qty == 0),
+            store_id=store_id,
+            scan_timestamp=scan_timestamp
+        )
     
     def _generate_scan_duration(self, item_count: int) -> str:
         """Generate realistic scan duration based on item count"""
         # Base time: 30 seconds + 45-90 seconds per item
         base_seconds = 30
-        per_item_seconds = random.randint(45, 90)
+        per_item_seconds = int(self._rng.integers(45, 91))
         total_seconds = base_seconds + (item_count * per_item_seconds)
         
         # Add some random variation (±20%)
-        variation = random.uniform(0.8, 1.2)
+        variation = self._rng.uniform(0.8, 1.2)
         total_seconds = int(total_seconds * variation)
         
         # Convert to HH:MM:SS format
@@ -215,105 +417,124 @@ class InventoryVerifier:
         
         anomaly_ratio = anomaly_count / total_items if total_items > 0 else 0
         
-        if avg_confidence >= 0.95 and anomaly_ratio <= 0.05:
-            return "excellent"
-        elif avg_confidence >= 0.85 and anomaly_ratio <= 0.15:
-            return "good"
-        elif avg_confidence >= 0.75 and anomaly_ratio <= 0.25:
-            return "acceptable"
-        elif avg_confidence >= 0.65 and anomaly_ratio <= 0.40:
-            return "poor"
-        else:
-            return "failed"
+        return _assess(float(avg_confidence), float(anomaly_ratio))
     
-    def detect_anomalies(self, scanned_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Detect and categorize anomalies in scanned items"""
-        anomalies = []
-        
-        for item in scanned_items:
-            # Out of stock anomaly
-            if item["quantity"] == 0:
+    def _analyze(self, batch: "ScanBatch") -> ScanAnalysis:
+        """Classify stock levels, detect anomalies and total value in a single pass"""
+        # detect_anomalies and generate_verification_report on the same batch share one analysis
+        if batch._analysis is not None and batch._analysis[0] == self.confidence_threshold:
+            return batch._analysis[1]
+        
+        quantity = batch.quantity
+        expected = batch.expected_quantity
+        
+        # Stock and confidence classification as masks over all items at once
+        out_of_stock = quantity == 0
+        low_stock = ~out_of_stock & (quantity < expected * 0.2)  # Less than 20% of expected
+        overstock = ~out_of_stock & ~low_stock & (quantity > expected * 1.5)  # More than 150% of expected
+        low_confidence = batch.confidence < self.confidence_threshold
+        manual_check = batch.requires_manual_check
+        
+        # Anomaly counts per type (ANOMALY_TYPES order), bucketed by severity code in one bincount
+        type_counts = np.array([np.count_nonzero(m) for m in
+                                (out_of_stock, low_stock, overstock, low_confidence, manual_check)])
+        by_severity = np.bincount(ANOMALY_SEVERITY_CODES, weights=type_counts, minlength=len(SEVERITY_LEVELS))
+        n_out, n_low, _, _, n_manual = type_counts.tolist()
+        
+        analysis = ScanAnalysis(
+            total_value=float(batch.total_value.sum()),
+            manual_check_count=n_manual,
+            in_stock=len(batch) - n_out,
+            out_of_stock=n_out,
+            low_stock=n_low,
+            severity_counts={level: int(by_severity[SEVERITY_LEVELS.index(level)]) for level in ("high", "medium", "low")}
+        )
+        
+        # Materialize anomaly records only for flagged items, in item order
+        anomalies = analysis.anomalies
+        flagged = np.flatnonzero(out_of_stock | low_stock | overstock | low_confidence | manual_check)
+        for i in flagged.tolist():
+            sku, name, location = batch.sku[i], batch.name[i], batch.location[i]
+            qty, exp = int(quantity[i]), int(expected[i])
+            
+            if out_of_stock[i]:
                 anomalies.append({
                     "type": "out_of_stock",
-                    "sku": item["sku"],
-                    "item_name": item["name"],
-                    "description": f"Item {item['name']} is out of stock",
+                    "sku": sku,
+                    "item_name": name,
+                    "description": f"Item {name} is out of stock",
                     "severity": "high",
-                    "expected_quantity": item["expected_quantity"],
+                    "expected_quantity": exp,
                     "actual_quantity": 0,
-                    "location": item["location"]
+                    "location": location
                 })
-            
-            # Low stock anomaly (less than 20% of expected)
-            elif item["quantity"] < item["expected_quantity"] * 0.2:
+            elif low_stock[i]:
                 anomalies.append({
                     "type": "low_stock",
-                    "sku": item["sku"],
-                    "item_name": item["name"],
-                    "description": f"Low stock: {item['quantity']} (expected ~{item['expected_quantity']})",
+                    "sku": sku,
+                    "item_name": name,
+                    "description": f"Low stock: {qty} (expected ~{exp})",
                     "severity": "medium",
-                    "expected_quantity": item["expected_quantity"],
-                    "actual_quantity": item["quantity"],
-                    "location": item["location"]
+                    "expected_quantity": exp,
+                    "actual_quantity": qty,
+                    "location": location
                 })
-            
-            # Overstock anomaly (more than 150% of expected)
-            elif item["quantity"] > item["expected_quantity"] * 1.5:
+            elif overstock[i]:
                 anomalies.append({
                     "type": "overstock",
-                    "sku": item["sku"],
-                    "item_name": item["name"],
-                    "description": f"Overstock: {item['quantity']} (expected ~{item['expected_quantity']})",
+                    "sku": sku,
+                    "item_name": name,
+                    "description": f"Overstock: {qty} (expected ~{exp})",
                     "severity": "low",
-                    "expected_quantity": item["expected_quantity"],
-                    "actual_quantity": item["quantity"],
-                    "location": item["location"]
+                    "expected_quantity": exp,
+                    "actual_quantity": qty,
+                    "location": location
                 })
             
-            # Low confidence anomaly
-            if item["confidence"] < self.confidence_threshold:
+            if low_confidence[i]:
+                confidence = float(batch.confidence[i])
                 anomalies.append({
                     "type": "low_confidence",
-                    "sku": item["sku"],
-                    "item_name": item["name"],
-                    "description": f"Low scan confidence: {item['confidence']:.2f}",
+                    "sku": sku,
+                    "item_name": name,
+                    "description": f"Low scan confidence: {confidence:.2f}",
                     "severity": "medium",
-                    "confidence": item["confidence"],
-                    "verification_method": item["verification_method"],
-                    "location": item["location"]
+                    "confidence": confidence,
+                    "verification_method": batch.verification_method[i],
+                    "location": location
                 })
             
-            # Manual check required
-            if item["requires_manual_check"]:
+            if manual_check[i]:
                 anomalies.append({
                     "type": "manual_check_required",
-                    "sku": item["sku"],
-                    "item_name": item["name"],
+                    "sku": sku,
+                    "item_name": name,
                     "description": f"Item requires manual verification",
                     "severity": "medium",
                     "reason": "Low confidence or out of stock",
-                    "location": item["location"]
+                    "location": location
                 })
         
-        return anomalies
+        batch._analysis = (self.confidence_threshold, analysis)
+        return analysis
+    
+    def detect_anomalies(self, scanned_items: Union[List[Dict[str, Any]], "ScanBatch"]) -> List[Dict[str, Any]]:
+        """Detect and categorize anomalies in scanned items"""
+        # Copies, so callers cannot modify the analysis cached on the batch
+        return [dict(anomaly) for anomaly in self._analyze(ScanBatch.coerce(scanned_items)).anomalies]
     
     def generate_verification_report(self, 
-                                   scanned_items: List[Dict[str, Any]], 
+                                   scanned_items: Union[List[Dict[str, Any]], "ScanBatch"], 
                                    scan_metadata: Dict[str, Any],
                                    store_id: str,
                                    section: str) -> Dict[str, Any]:
         """Generate a comprehensive verification report"""
         
-        anomalies = self.detect_anomalies(scanned_items)
-        
-        # Calculate financial metrics
-        total_value = sum(item["total_value"] for item in scanned_items)
-        items_requiring_attention = len([item for item in scanned_items if item["requires_manual_check"]])
-        
-        # Categorize items by status
-        in_stock_items = [item for item in scanned_items if item["quantity"] > 0]
-        out_of_stock_items = [item for item in scanned_items if item["quantity"] == 0]
-        low_stock_items = [item for item in scanned_items if 0 < item["quantity"] < item["expected_quantity"] * 0.2]
+        batch = ScanBatch.coerce(scanned_items)
+        analysis = self._analyze(batch)
+        anomalies = [dict(anomaly) for anomaly in analysis.anomalies]
+        if isinstance(scanned_items, ScanBatch):
+            scanned_items = batch.to_items()
         
         report = {
             "report_id": f"{store_id}_{section}_{int(datetime.now().timestamp())}",
@@ -322,24 +543,20 @@ class InventoryVerifier:
             "scan_metadata": scan_metadata,
             "summary": {
                 "total_items_scanned": len(scanned_items),
-                "total_inventory_value": total_value,
+                "total_inventory_value": analysis.total_value,
                 "average_confidence": scan_metadata["average_confidence"],
                 "verification_quality": scan_metadata["verification_quality"],
-                "items_requiring_attention": items_requiring_attention
+                "items_requiring_attention": analysis.manual_check_count
             },
             "stock_status": {
-                "in_stock": len(in_stock_items),
-                "out_of_stock": len(out_of_stock_items),
-                "low_stock": len(low_stock_items),
-                "adequately_stocked": len(in_stock_items) - len(low_stock_items)
+                "in_stock": analysis.in_stock,
+                "out_of_stock": analysis.out_of_stock,
+                "low_stock": analysis.low_stock,
+                "adequately_stocked": analysis.in_stock - analysis.low_stock
             },
             "anomalies": {
                 "total_count": len(anomalies),
-                "by_severity": {
-                    "high": len([a for a in anomalies if a["severity"] == "high"]),
-                    "medium": len([a for a in anomalies if a["severity"] == "medium"]),
-                    "low": len([a for a in anomalies if a["severity"] == "low"])
-                },
+                "by_severity": dict(analysis.severity_counts),
                 "details": anomalies
             },
             "items": scanned_items,
@@ -348,10 +565,15 @@ class InventoryVerifier:
         
         return report
 
+def _run_one(demo_scenario: Tuple[str, str, str]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Run one demo scan in a worker process and return its metadata and anomalies"""
+    store_id, section, scenario = demo_scenario
+    verifier = InventoryVerifier()
+    batch, metadata = verifier.scan_inventory_batch(store_id, section, scenario)
+    return metadata, verifier.detect_anomalies(batch)
+
 def demo_verification_scenarios():
     """Demonstrate different verification scenarios"""
-    verifier = InventoryVerifier()
-    
     print("📊 Inventory Verification Scenario Demo")
     print("=" * 60)
     
@@ -363,13 +585,14 @@ def demo_verification_scenarios():
         ("store_123", "gaming", "mixed")
     ]
     
-    for store_id, section, scenario in demo_scenarios:
+    # The scans are independent, so run them on separate cores and only print here
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_run_one, demo_scenarios))
+    
+    for (store_id, section, scenario), (metadata, anomalies) in zip(demo_scenarios, results):
         print(f"\n🔍 {scenario.upper()} scenario: {store_id}/{section}")
         print("-" * 40)
         
-        scanned_items, metadata = verifier.scan_inventory(store_id, section, scenario)
-        anomalies = verifier.detect_anomalies(scanned_items)
-        
         print(f"Items scanned: {metadata['total_items_scanned']}")
         print(f"Average confidence: {metadata['average_confidence']:.2f}")
         print(f"Quality: {metadata['verification_quality']}")
@@ -6,14 +6,23 @@ Performs inventory verification and submits PoA packages for evaluation
 import os
 import sys
 import json
+import asyncio
+import functools
 import logging
+import operator
 import random
-from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
-from typing_extensions import TypedDict
+import secrets
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from typing_extensions import Annotated, TypedDict
+
+import numpy as np
 
 # LangGraph imports
 from langgraph.graph import StateGraph
+from langgraph.types import Send
 from langgraph.prebuilt import create_react_agent
 
 # Add project root to path
@@ -21,7 +30,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from agents.shared.constants import *
 from agents.shared.ipfs_client import IPFSClient
-from web3 import Web3
+from web3 import AsyncWeb3, AsyncHTTPProvider
 from eth_account import Account
 
 # Configure logging
@@ -35,6 +44,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Action types accepted by execute_verification, as a set for O(1) membership checks
+_SUPPORTED_ACTION_TYPES_SET = frozenset(SUPPORTED_ACTION_TYPES)
+
+# Sample items paired with their lowercased category, computed once at import
+_SAMPLE_CATEGORIES = tuple((item, item["category"].lower()) for item in SAMPLE_INVENTORY_ITEMS)
+
+@functools.lru_cache(maxsize=256)
+def _items_for_section(section: str) -> Tuple[Dict[str, Any], ...]:
+    """Sample items whose category contains the lowercased section, in sample order"""
+    return tuple(item for item, category in _SAMPLE_CATEGORIES if section in category)
+
+class ScannedItems(TypedDict):
+    """Scanned items as columns: NumPy arrays for numeric fields, lists for strings"""
+    sku: List[str]
+    name: List[str]
+    category: List[str]
+    quantity: np.ndarray
+    unit_price: np.ndarray
+    location: List[str]
+    verification_method: List[str]
+    confidence: np.ndarray
+    scan_timestamp: str  # Shared by every item in the scan
+
+def _items_to_records(items: ScannedItems) -> List[Dict[str, Any]]:
+    """Expand scanned item columns into per-item dicts with native Python values"""
+    scan_timestamp = items["scan_timestamp"]
+    return [
+        {
+            "sku": sku,
+            "name": name,
+            "category": category,
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "location": location,
+            "verification_method": method,
+            "confidence": confidence,
+            "scan_timestamp": scan_timestamp
+        }
+        for sku, name, category, quantity, unit_price, location, method, confidence in zip(
+            items["sku"], items["name"], items["category"], items["quantity"].tolist(),
+            items["unit_price"].tolist(), items["location"], items["verification_method"],
+            items["confidence"].tolist()
+        )
+    ]
+
 class WorkerAgentState(TypedDict):
     """State schema for Worker Agent workflow"""
     # Input parameters
@@ -50,13 +104,14 @@ class WorkerAgentState(TypedDict):
     
     # Inventory scanning results
     scan_completed: bool
-    items_scanned: List[Dict[str, Any]]
+    items_scanned: ScannedItems
     total_items: int
     scan_duration: str
     anomalies: List[Dict[str, Any]]
     scan_confidence: float
     
-    # PoA package creation
+    # PoA package creation (parts are built by parallel branches and merged key-wise)
+    poa_parts: Annotated[Dict[str, Any], operator.or_]
     poa_package: Dict[str, Any]
     package_hash: str
     ipfs_hash: str
@@ -67,22 +122,288 @@ class WorkerAgentState(TypedDict):
     gas_used: int
     verification_fee_paid: float
     
-    # Timestamps
+    # Timestamps: monotonic ns inside the workflow, ISO strings filled in on the returned state
+    started_at_ns: int
+    completed_at_ns: int
+    elapsed_ms: int
     started_at: str
     completed_at: str
 
+def _stamp_times(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill elapsed_ms and the ISO started_at/completed_at of a finished run from its monotonic timestamps"""
+    now_ns = time.perf_counter_ns()
+    completed_ns = state.get("completed_at_ns") or now_ns
+    elapsed_ns = completed_ns - (state.get("started_at_ns") or completed_ns)
+    completed_at = datetime.now(timezone.utc) - timedelta(microseconds=(now_ns - completed_ns) // 1000)
+    
+    state["elapsed_ms"] = elapsed_ns // 1_000_000
+    state["started_at"] = (completed_at - timedelta(microseconds=elapsed_ns // 1000)).isoformat()
+    state["completed_at"] = completed_at.isoformat()
+    return state
+
+# Workflow nodes: defined once at import and bound to an agent with functools.partial
+
+def initialize_scan(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Initialize the inventory scanning process"""
+    logger.info("🏁 Starting inventory scan for store %s", state['store_id'])
+    
+    return {
+        "current_step": "scanning",
+        "status": "scanning",
+        "scan_completed": False,
+        "started_at_ns": time.perf_counter_ns()
+    }
+
+def perform_inventory_scan(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Simulate inventory scanning process"""
+    store_id = state["store_id"]
+    section = state["section"]
+    
+    logger.info("📦 Scanning %s section in %s", section, store_id)
+    
+    # Simulate scanning process
+    scanned_items = agent._simulate_inventory_scan(store_id, section)
+    scan_duration = f"00:{random.randint(10, 25)}:{random.randint(10, 59)}"
+    
+    # Calculate confidence based on scan quality
+    confidence = agent._calculate_scan_confidence(scanned_items)
+    
+    # Detect anomalies
+    anomalies = agent._detect_anomalies(scanned_items)
+    
+    total_items = len(scanned_items["sku"])
+    logger.info("✅ Scan completed: %d items, confidence: %.2f", total_items, confidence)
+    
+    return {
+        "current_step": "scan_completed",
+        "scan_completed": True,
+        "items_scanned": scanned_items,
+        "total_items": total_items,
+        "scan_duration": scan_duration,
+        "scan_confidence": confidence,
+        "anomalies": anomalies
+    }
+
+def prepare_evidence(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Prepare the evidence and submission ID, which do not depend on the scan"""
+    # Runs alongside the scan, so it returns only its own key
+    now = datetime.now()
+    evidence = {
+        "scan_logs": f"scan_log_{state['store_id']}_{now.strftime('%Y%m%d_%H%M%S')}",
+        "verification_method": "automated_barcode_scan",
+        "agent_id": agent.agent_id,
+        "scan_metadata": {
+            "confidence_threshold": WORKER_AGENT_DEFAULTS["confidence_threshold"],
+            "scan_method": "simulated"
+        }
+    }
+    
+    # Generate unique submission ID
+    submission_id = f"{state['store_id']}_{state['action_type']}_{int(now.timestamp())}"
+    
+    return {"poa_parts": {"evidence": evidence, "submission_id": submission_id}}
+
+def build_inventory_payload(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Assemble the inventory data section of the PoA package from the scan"""
+    logger.info("📄 Creating PoA package...")
+    
+    # Prepare inventory data
+    inventory_data = {
+        "store_id": state["store_id"],
+        "scan_timestamp": datetime.now(timezone.utc).isoformat(),
+        "section": state["section"],
+        "items": _items_to_records(state["items_scanned"]),  # Per-item records only for serialization
+        "total_items_scanned": state["total_items"],
+        "verification_duration": state["scan_duration"],
+        "scan_confidence": state["scan_confidence"],
+        "anomalies": state["anomalies"],
+        "verification_notes": f"Automated scan by {agent.agent_id}"
+    }
+    
+    return {"poa_parts": {"inventory_data": inventory_data}}
+
+def compute_package_hash(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Create the hashed PoA package from the prepared parts"""
+    parts = state["poa_parts"]
+    
+    # Create PoA package
+    poa_package = agent.ipfs_client.create_poa_package(
+        submission_id=parts["submission_id"],
+        studio_id=STUDIO_ID,
+        worker_agent_id=agent.agent_id,
+        action_type=state["action_type"],
+        inventory_data=parts["inventory_data"],
+        evidence=parts["evidence"],
+        hash_algo=POA_HASH_ALGO
+    )
+    
+    logger.info("📦 PoA package created with hash: %s", poa_package['package_hash'])
+    
+    return {
+        "current_step": "poa_created",
+        "poa_package": poa_package,
+        "package_hash": poa_package["package_hash"]
+    }
+
+async def upload_to_ipfs(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Upload PoA package to IPFS"""
+    logger.info("🌐 Uploading PoA package to IPFS...")
+    
+    # Upload to IPFS, bounded so a fleet of workers doesn't flood the node
+    ipfs_sem, _ = agent._limits()
+    async with ipfs_sem:
+        ipfs_hash = await agent.ipfs_client.upload_poa_package_async(state["poa_package"])
+    
+    if ipfs_hash:
+        logger.info("✅ Uploaded to IPFS: %s", ipfs_hash)
+        return {
+            "current_step": "ipfs_uploaded",
+            "ipfs_hash": ipfs_hash
+        }
+    else:
+        logger.warning("⚠️ IPFS upload failed - using package hash as fallback")
+        return {
+            "current_step": "ipfs_failed",
+            "ipfs_hash": state["package_hash"],  # Fallback to package hash
+            "error_message": "IPFS upload failed, using local hash"
+        }
+
+async def submit_to_blockchain(agent: "WorkerAgent", state: WorkerAgentState) -> Dict[str, Any]:
+    """Submit PoA to blockchain via Studio contract"""
+    logger.info("⛓️ Submitting PoA to blockchain...")
+    
+    if agent.simulation_mode:
+        # Simulate blockchain submission
+        logger.info("🎭 Simulation mode: generating mock transaction")
+        
+        tx_hash = "0x" + secrets.token_hex(32)
+        submission_id = random.randint(1000, 9999)
+        gas_used = random.randint(250000, 350000)
+        
+        return {
+            "current_step": "submitted",
+            "status": "submitted",
+            "tx_hash": tx_hash,
+            "submission_id": submission_id,
+            "gas_used": gas_used,
+            "verification_fee_paid": VERIFICATION_FEE_ETH,
+            "completed_at_ns": time.perf_counter_ns()
+        }
+    
+    try:
+        # Real blockchain submission
+        package_hash_bytes = bytes.fromhex(state["package_hash"])
+        ipfs_hash = state["ipfs_hash"]
+        studio_address = agent.studio_address
+        
+        nonce, gas_price, chain_id = await agent._fetch_tx_params()
+        
+        # Prepare transaction data (simplified for PoC)
+        # In real implementation, this would use the actual contract ABI
+        transaction = {
+            'to': studio_address,
+            'value': agent.w3.to_wei(VERIFICATION_FEE_ETH, 'ether'),
+            'gas': GAS_LIMITS["submit_poa"],
+            'gasPrice': gas_price,
+            'nonce': nonce,
+            'chainId': chain_id,
+            'data': f"0x{package_hash_bytes.hex()}"  # Simplified data
+        }
+        
+        # Sign and send transaction
+        signed_txn = agent.w3.eth.account.sign_transaction(transaction, agent.private_key)
+        _, rpc_sem = agent._limits()
+        async with rpc_sem:
+            tx_hash = await agent.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        
+        # Wait for confirmation
+        receipt = await agent.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=TX_TIMEOUT_SECONDS)
+        
+        tx_hash_hex = tx_hash.hex()
+        logger.info("✅ Transaction confirmed: %s", tx_hash_hex)
+        
+        return {
+            "current_step": "submitted",
+            "status": "submitted",
+            "tx_hash": tx_hash_hex,
+            "submission_id": receipt['blockNumber'],  # Simplified
+            "gas_used": receipt['gasUsed'],
+            "verification_fee_paid": VERIFICATION_FEE_ETH,
+            "completed_at_ns": time.perf_counter_ns()
+        }
+        
+    except Exception as e:
+        logger.error("❌ Blockchain submission failed: %s", e)
+        # The reserved nonce may be unused now, so resync from the chain on the next submission
+        agent._nonce = None
+        return {
+            "current_step": "failed",
+            "status": "failed",
+            "error_message": str(e)
+        }
+
+# Node order of the direct pipeline; the LangGraph workflow runs scan and prepare_evidence in parallel
+WORKFLOW_NODES = (
+    ("initialize", initialize_scan),
+    ("scan", perform_inventory_scan),
+    ("prepare_evidence", prepare_evidence),
+    ("build_inventory_payload", build_inventory_payload),
+    ("compute_package_hash", compute_package_hash),
+    ("upload", upload_to_ipfs),
+    ("submit", submit_to_blockchain)
+)
+
 class WorkerAgent:
     """
     DVN Worker Agent that performs inventory verification and submits PoA packages
     """
     
-    def __init__(self, private_key: str = None, agent_id: str = None):
+    # Connections shared by all worker agents in the process, keyed by endpoint
+    _W3_POOL: Dict[str, AsyncWeb3] = {}
+    _IPFS_POOL: Dict[str, IPFSClient] = {}
+    
+    # (IPFS upload, transaction send) concurrency limits shared by all worker agents.
+    # asyncio semaphores belong to one event loop, so each running loop gets its own pair.
+    _LIMITS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[asyncio.Semaphore, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+    
+    @classmethod
+    def _limits(cls) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Get the IPFS upload and transaction send semaphores for the running event loop"""
+        loop = asyncio.get_running_loop()
+        limits = cls._LIMITS.get(loop)
+        if limits is None:
+            limits = (asyncio.Semaphore(IPFS_MAX_CONCURRENCY), asyncio.Semaphore(RPC_MAX_CONCURRENCY))
+            cls._LIMITS[loop] = limits
+        return limits
+    
+    @classmethod
+    def _get_w3(cls, rpc_url: str) -> AsyncWeb3:
+        """Get the shared AsyncWeb3 instance for an RPC URL, reusing its HTTP session"""
+        w3 = cls._W3_POOL.get(rpc_url)
+        if w3 is None:
+            w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
+            cls._W3_POOL[rpc_url] = w3
+        return w3
+    
+    @classmethod
+    def _get_ipfs_client(cls, ipfs_url: str) -> IPFSClient:
+        """Get the shared IPFS client for a node URL"""
+        ipfs_client = cls._IPFS_POOL.get(ipfs_url)
+        if ipfs_client is None:
+            ipfs_client = IPFSClient(ipfs_url)
+            cls._IPFS_POOL[ipfs_url] = ipfs_client
+        return ipfs_client
+    
+    def __init__(self, private_key: str = None, agent_id: str = None,
+                 ipfs_client: Optional[IPFSClient] = None, web3_client: Optional[AsyncWeb3] = None):
         """
         Initialize Worker Agent
         
         Args:
             private_key: Private key for blockchain transactions
             agent_id: Unique identifier for this worker agent
+            ipfs_client: IPFS client to use instead of the pooled one for IPFS_NODE_URL
+            web3_client: Web3 connection to use instead of the pooled one for SEPOLIA_RPC_URL
         """
         self.private_key = private_key or os.getenv('PRIVATE_KEY')
         self.agent_id = agent_id or os.getenv('WORKER_AGENT_ID', f'wa_{random.randint(1000, 9999)}')
@@ -100,223 +421,71 @@ class WorkerAgent:
             try:
                 self.account = Account.from_key(self.private_key)
             except Exception as e:
-                logger.warning(f"Invalid private key format: {e} - enabling simulation mode")
+                logger.warning("Invalid private key format: %s - enabling simulation mode", e)
                 self.simulation_mode = True
                 self.account = None
             
-        # Initialize Web3 connection
-        self.w3 = Web3(Web3.HTTPProvider(SEPOLIA_RPC_URL))
-        
-        # Initialize IPFS client
-        self.ipfs_client = IPFSClient()
+        # Web3 connection (async, so RPC waits don't block the event loop) and IPFS client,
+        # unless given, are created on first use (see the properties below)
+        self._w3 = web3_client
+        self._ipfs_client = ipfs_client
         
         # Initialize contract interfaces (simplified for PoC)
         self.studio_address = CONTRACT_ADDRESSES["studio_poc"]
         
-        logger.info(f"Worker Agent {self.agent_id} initialized (simulation_mode={self.simulation_mode})")
+        # Transaction parameters cached across submissions: locally incremented nonce
+        # (with its last chain sync time), (gas price, fetched at) and chain ID
+        self._nonce: Optional[int] = None
+        self._nonce_synced_at = 0.0
+        # Serializes nonce resyncs; asyncio locks belong to one event loop, so one per loop
+        self._nonce_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._gas_price_cache: Tuple[int, float] = (0, 0.0)
+        self._chain_id: Optional[int] = None
+        
+        # Shared random generator for the simulated scan draws
+        self._rng = np.random.default_rng()
+        
+        # Run nodes as a plain pipeline unless the LangGraph workflow is requested (e.g. for checkpointing)
+        self.use_langgraph = WORKER_USE_LANGGRAPH
+        
+        # Compiled LangGraph workflow, built on first use and reused across runs
+        self._compiled_workflow = None
+        
+        logger.info("Worker Agent %s initialized (simulation_mode=%s)", self.agent_id, self.simulation_mode)
+    
+    @property
+    def w3(self) -> AsyncWeb3:
+        """Web3 connection, shared with other agents using the same RPC URL"""
+        if self._w3 is None:
+            self._w3 = self._get_w3(SEPOLIA_RPC_URL)
+        return self._w3
+    
+    @property
+    def ipfs_client(self) -> IPFSClient:
+        """IPFS client, shared with other agents using the same node"""
+        if self._ipfs_client is None:
+            self._ipfs_client = self._get_ipfs_client(IPFS_NODE_URL)
+        return self._ipfs_client
     
     def create_workflow(self) -> StateGraph:
         """Create the Worker Agent LangGraph workflow"""
         
-        # Define workflow nodes
-        def initialize_scan(state: WorkerAgentState) -> WorkerAgentState:
-            """Initialize the inventory scanning process"""
-            logger.info(f"🏁 Starting inventory scan for store {state['store_id']}")
-            
-            return {
-                **state,
-                "current_step": "scanning",
-                "status": "scanning",
-                "scan_completed": False,
-                "started_at": datetime.now(timezone.utc).isoformat()
-            }
-        
-        def perform_inventory_scan(state: WorkerAgentState) -> WorkerAgentState:
-            """Simulate inventory scanning process"""
-            store_id = state["store_id"]
-            section = state["section"]
-            
-            logger.info(f"📦 Scanning {section} section in {store_id}")
-            
-            # Simulate scanning process
-            scanned_items = self._simulate_inventory_scan(store_id, section)
-            scan_duration = f"00:{random.randint(10, 25)}:{random.randint(10, 59)}"
-            
-            # Calculate confidence based on scan quality
-            confidence = self._calculate_scan_confidence(scanned_items)
-            
-            # Detect anomalies
-            anomalies = self._detect_anomalies(scanned_items)
-            
-            logger.info(f"✅ Scan completed: {len(scanned_items)} items, confidence: {confidence:.2f}")
-            
-            return {
-                **state,
-                "current_step": "scan_completed",
-                "scan_completed": True,
-                "items_scanned": scanned_items,
-                "total_items": len(scanned_items),
-                "scan_duration": scan_duration,
-                "scan_confidence": confidence,
-                "anomalies": anomalies
-            }
-        
-        def create_poa_package(state: WorkerAgentState) -> WorkerAgentState:
-            """Create PoA package for submission"""
-            logger.info("📄 Creating PoA package...")
-            
-            # Prepare inventory data
-            inventory_data = {
-                "store_id": state["store_id"],
-                "scan_timestamp": datetime.now(timezone.utc).isoformat(),
-                "section": state["section"],
-                "items": state["items_scanned"],
-                "total_items_scanned": state["total_items"],
-                "verification_duration": state["scan_duration"],
-                "scan_confidence": state["scan_confidence"],
-                "anomalies": state["anomalies"],
-                "verification_notes": f"Automated scan by {self.agent_id}"
-            }
-            
-            # Create evidence package
-            evidence = {
-                "scan_logs": f"scan_log_{state['store_id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                "verification_method": "automated_barcode_scan",
-                "agent_id": self.agent_id,
-                "scan_metadata": {
-                    "confidence_threshold": WORKER_AGENT_DEFAULTS["confidence_threshold"],
-                    "scan_method": "simulated"
-                }
-            }
-            
-            # Generate unique submission ID
-            submission_id = f"{state['store_id']}_{state['action_type']}_{int(datetime.now().timestamp())}"
-            
-            # Create PoA package
-            poa_package = self.ipfs_client.create_poa_package(
-                submission_id=submission_id,
-                studio_id=STUDIO_ID,
-                worker_agent_id=self.agent_id,
-                action_type=state["action_type"],
-                inventory_data=inventory_data,
-                evidence=evidence
-            )
-            
-            logger.info(f"📦 PoA package created with hash: {poa_package['package_hash']}")
-            
-            return {
-                **state,
-                "current_step": "poa_created",
-                "poa_package": poa_package,
-                "package_hash": poa_package["package_hash"]
-            }
-        
-        def upload_to_ipfs(state: WorkerAgentState) -> WorkerAgentState:
-            """Upload PoA package to IPFS"""
-            logger.info("🌐 Uploading PoA package to IPFS...")
-            
-            # Upload to IPFS
-            ipfs_hash = self.ipfs_client.upload_poa_package(state["poa_package"])
-            
-            if ipfs_hash:
-                logger.info(f"✅ Uploaded to IPFS: {ipfs_hash}")
-                return {
-                    **state,
-                    "current_step": "ipfs_uploaded",
-                    "ipfs_hash": ipfs_hash
-                }
-            else:
-                logger.warning("⚠️ IPFS upload failed - using package hash as fallback")
-                return {
-                    **state,
-                    "current_step": "ipfs_failed",
-                    "ipfs_hash": state["package_hash"],  # Fallback to package hash
-                    "error_message": "IPFS upload failed, using local hash"
-                }
-        
-        def submit_to_blockchain(state: WorkerAgentState) -> WorkerAgentState:
-            """Submit PoA to blockchain via Studio contract"""
-            logger.info("⛓️ Submitting PoA to blockchain...")
-            
-            if self.simulation_mode:
-                # Simulate blockchain submission
-                logger.info("🎭 Simulation mode: generating mock transaction")
-                
-                tx_hash = f"0x{''.join(random.choices('0123456789abcdef', k=64))}"
-                submission_id = random.randint(1000, 9999)
-                gas_used = random.randint(250000, 350000)
-                
-                return {
-                    **state,
-                    "current_step": "submitted",
-                    "status": "submitted",
-                    "tx_hash": tx_hash,
-                    "submission_id": submission_id,
-                    "gas_used": gas_used,
-                    "verification_fee_paid": VERIFICATION_FEE_ETH,
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }
-            
-            try:
-                # Real blockchain submission
-                package_hash_bytes = bytes.fromhex(state["package_hash"])
-                ipfs_hash = state["ipfs_hash"]
-                studio_address = self.studio_address
-                
-                # Prepare transaction data (simplified for PoC)
-                # In real implementation, this would use the actual contract ABI
-                transaction = {
-                    'to': studio_address,
-                    'value': self.w3.to_wei(VERIFICATION_FEE_ETH, 'ether'),
-                    'gas': GAS_LIMITS["submit_poa"],
-                    'gasPrice': self.w3.to_wei(20, 'gwei'),
-                    'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                    'data': f"0x{package_hash_bytes.hex()}"  # Simplified data
-                }
-                
-                # Sign and send transaction
-                signed_txn = self.w3.eth.account.sign_transaction(transaction, self.private_key)
-                tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-                
-                # Wait for confirmation
-                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=TX_TIMEOUT_SECONDS)
-                
-                logger.info(f"✅ Transaction confirmed: {tx_hash.hex()}")
-                
-                return {
-                    **state,
-                    "current_step": "submitted",
-                    "status": "submitted",
-                    "tx_hash": tx_hash.hex(),
-                    "submission_id": receipt['blockNumber'],  # Simplified
-                    "gas_used": receipt['gasUsed'],
-                    "verification_fee_paid": VERIFICATION_FEE_ETH,
-                    "completed_at": datetime.now(timezone.utc).isoformat()
-                }
-                
-            except Exception as e:
-                logger.error(f"❌ Blockchain submission failed: {e}")
-                return {
-                    **state,
-                    "current_step": "failed",
-                    "status": "failed",
-                    "error_message": str(e)
-                }
+        def fan_out(state: WorkerAgentState) -> List[Send]:
+            """Run the scan and evidence preparation as parallel branches"""
+            return [Send("scan", state), Send("prepare_evidence", state)]
         
         # Create the workflow graph
         workflow = StateGraph(WorkerAgentState)
         
-        # Add nodes
-        workflow.add_node("initialize", initialize_scan)
-        workflow.add_node("scan", perform_inventory_scan)
-        workflow.add_node("create_poa", create_poa_package)
-        workflow.add_node("upload", upload_to_ipfs)
-        workflow.add_node("submit", submit_to_blockchain)
-        
-        # Add edges
-        workflow.add_edge("initialize", "scan")
-        workflow.add_edge("scan", "create_poa")
-        workflow.add_edge("create_poa", "upload")
+        # Add nodes (module-level node functions bound to this agent)
+        for name, node in WORKFLOW_NODES:
+            workflow.add_node(name, functools.partial(node, self))
+        
+        # Add edges (the payload waits for both branches)
+        workflow.add_conditional_edges("initialize", fan_out, ["scan", "prepare_evidence"])
+        workflow.add_edge(["scan", "prepare_evidence"], "build_inventory_payload")
+        workflow.add_edge("build_inventory_payload", "compute_package_hash")
+        workflow.add_edge("compute_package_hash", "upload")
         workflow.add_edge("upload", "submit")
         
         # Set entry and exit points
@@ -325,102 +494,163 @@ class WorkerAgent:
         
         return workflow
     
-    def _simulate_inventory_scan(self, store_id: str, section: str) -> List[Dict[str, Any]]:
-        """Simulate inventory scanning for a store section"""
-        
-        # Filter items by section
-        available_items = [
-            item for item in SAMPLE_INVENTORY_ITEMS 
-            if section.lower() in item["category"].lower()
-        ]
-        
-        # If no items match, use all items
-        if not available_items:
-            available_items = SAMPLE_INVENTORY_ITEMS
+    async def _fetch_tx_params(self) -> Tuple[int, int, int]:
+        """
+        Reserve the next nonce and return it with the gas price and chain ID
         
-        scanned_items = []
+        The nonce is tracked locally and only reconciled with the chain's pending count
+        every NONCE_RESYNC_SECONDS; the gas price is cached for GAS_PRICE_TTL_SECONDS and
+        capped at MAX_GAS_PRICE_GWEI.
+        In a steady burst of submissions this needs no RPC round-trip at all.
+        """
+        # Callers that find the nonce stale wait here for one resync, then re-check it
+        loop = asyncio.get_running_loop()
+        lock = self._nonce_locks.get(loop)
+        if lock is None:
+            lock = self._nonce_locks[loop] = asyncio.Lock()
         
-        # Simulate scanning each item type with quantity variations
-        for item_template in available_items:
-            # Random quantity variation (±20% of typical)
-            base_qty = item_template["typical_quantity"]
-            variation = random.randint(-int(base_qty * 0.2), int(base_qty * 0.2))
-            actual_qty = max(0, base_qty + variation)
-            
-            # Simulate confidence based on scan method
-            confidence = random.uniform(0.85, 0.98)
+        async with lock:
+            now = time.monotonic()
+            pending = {}
+            if self._nonce is None or now - self._nonce_synced_at > NONCE_RESYNC_SECONDS:
+                pending["nonce"] = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+            if now - self._gas_price_cache[1] > GAS_PRICE_TTL_SECONDS:
+                pending["gas_price"] = self.w3.eth.gas_price
+            if self._chain_id is None:
+                pending["chain_id"] = self.w3.eth.chain_id
             
-            scanned_item = {
-                "sku": item_template["sku"],
-                "name": item_template["name"],
-                "category": item_template["category"],
-                "quantity": actual_qty,
-                "unit_price": item_template["unit_price"],
-                "location": f"Aisle-{random.choice(['A', 'B', 'C'])}-Shelf-{random.randint(1, 5)}",
-                "verification_method": random.choice(WORKER_AGENT_DEFAULTS["verification_methods"]),
-                "confidence": confidence,
-                "scan_timestamp": datetime.now(timezone.utc).isoformat()
-            }
+            if pending:
+                # The reads are independent, so issue them concurrently instead of back to back
+                fetched = dict(zip(pending, await asyncio.gather(*pending.values())))
+                if "nonce" in fetched:
+                    # Trust the chain, so a transaction dropped without an error doesn't leave a gap
+                    self._nonce = fetched["nonce"]
+                    self._nonce_synced_at = now
+                if "gas_price" in fetched:
+                    max_gas_price = self.w3.to_wei(MAX_GAS_PRICE_GWEI, 'gwei')
+                    self._gas_price_cache = (min(fetched["gas_price"], max_gas_price), now)
+                if "chain_id" in fetched:
+                    self._chain_id = fetched["chain_id"]
             
-            scanned_items.append(scanned_item)
+            # Reserve the nonce while holding the lock, so concurrent callers get distinct ones
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce, self._gas_price_cache[0], self._chain_id
+    
+    def _simulate_inventory_scan(self, store_id: str, section: str) -> ScannedItems:
+        """Simulate inventory scanning for a store section"""
+        
+        # Filter items by section; if no items match, use all items
+        available_items = _items_for_section(section.lower()) or SAMPLE_INVENTORY_ITEMS
+        
+        rng = self._rng
+        n = len(available_items)
         
-        return scanned_items
+        # Draw every item's random values at once: quantity variation (±20% of typical),
+        # confidence, location and verification method
+        base_qty = np.fromiter((item["typical_quantity"] for item in available_items), dtype=np.int64, count=n)
+        spread = (base_qty * 0.2).astype(np.int64)
+        aisles = rng.integers(0, 3, size=n)
+        shelves = rng.integers(1, 6, size=n)
+        methods = WORKER_AGENT_DEFAULTS["verification_methods"]
+        
+        return ScannedItems(
+            sku=[item["sku"] for item in available_items],
+            name=[item["name"] for item in available_items],
+            category=[item["category"] for item in available_items],
+            quantity=np.maximum(0, base_qty + rng.integers(-spread, spread + 1)),
+            unit_price=np.fromiter((item["unit_price"] for item in available_items), dtype=np.float64, count=n),
+            location=[f"Aisle-{'ABC'[aisle]}-Shelf-{shelf}" for aisle, shelf in zip(aisles.tolist(), shelves.tolist())],
+            verification_method=[methods[i] for i in rng.integers(0, len(methods), size=n).tolist()],
+            confidence=rng.uniform(0.85, 0.98, size=n),
+            # All items are scanned "at the same time", so they share one timestamp
+            scan_timestamp=datetime.now(timezone.utc).isoformat()
+        )
     
-    def _calculate_scan_confidence(self, items: List[Dict[str, Any]]) -> float:
+    def _calculate_scan_confidence(self, items: ScannedItems) -> float:
         """Calculate overall scan confidence"""
-        if not items:
+        if not len(items["confidence"]):
             return 0.0
         
-        confidences = [item.get("confidence", 0.8) for item in items]
-        return sum(confidences) / len(confidences)
+        return float(items["confidence"].mean())
     
-    def _detect_anomalies(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _detect_anomalies(self, items: ScannedItems) -> List[Dict[str, Any]]:
         """Detect potential inventory anomalies"""
-        anomalies = []
+        quantity = items["quantity"]
+        confidence = items["confidence"]
+        sku = items["sku"]
+        name = items["name"]
+        
+        # Low quantity and low confidence checks over all items at once; records are
+        # built only for the flagged items, in item order
+        out_of_stock = quantity == 0
+        low_confidence = confidence < WORKER_AGENT_DEFAULTS["confidence_threshold"]
         
-        for item in items:
-            # Low quantity anomaly
-            if item["quantity"] == 0:
+        anomalies = []
+        for i in np.flatnonzero(out_of_stock | low_confidence).tolist():
+            if out_of_stock[i]:
                 anomalies.append({
                     "type": "out_of_stock",
-                    "sku": item["sku"],
-                    "description": f"Item {item['name']} is out of stock",
+                    "sku": sku[i],
+                    "description": f"Item {name[i]} is out of stock",
                     "severity": "high"
                 })
             
-            # Low confidence anomaly
-            if item["confidence"] < WORKER_AGENT_DEFAULTS["confidence_threshold"]:
+            if low_confidence[i]:
                 anomalies.append({
                     "type": "low_confidence",
-                    "sku": item["sku"],
-                    "description": f"Low scan confidence: {item['confidence']:.2f}",
+                    "sku": sku[i],
+                    "description": f"Low scan confidence: {float(confidence[i]):.2f}",
                     "severity": "medium"
                 })
         
         return anomalies
     
     def execute_verification(self, store_id: str, section: str = "electronics", 
-                           action_type: str = "KiranaAI_StockReport") -> Dict[str, Any]:
+                           action_type: str = "KiranaAI_StockReport",
+                           use_langgraph: Optional[bool] = None) -> Dict[str, Any]:
         """
         Execute complete inventory verification workflow
         
+        Synchronous wrapper around execute_verification_async; call that coroutine
+        directly from code that already runs an event loop.
+        
+        Args:
+            store_id: Store identifier
+            section: Store section to scan
+            action_type: Type of verification action
+            use_langgraph: Run the LangGraph workflow instead of calling the nodes directly
+                (defaults to the USE_LANGGRAPH setting)
+            
+        Returns:
+            Final workflow state
+        """
+        return asyncio.run(self.execute_verification_async(store_id, section, action_type, use_langgraph))
+    
+    async def execute_verification_async(self, store_id: str, section: str = "electronics", 
+                                       action_type: str = "KiranaAI_StockReport",
+                                       use_langgraph: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Execute complete inventory verification workflow (coroutine)
+        
         Args:
             store_id: Store identifier
             section: Store section to scan
             action_type: Type of verification action
+            use_langgraph: Run the LangGraph workflow instead of calling the nodes directly
+                (defaults to the USE_LANGGRAPH setting)
             
         Returns:
             Final workflow state
         """
-        logger.info(f"🚀 Starting inventory verification for {store_id}/{section}")
+        logger.info("🚀 Starting inventory verification for %s/%s", store_id, section)
         
         # Validate action type
-        if not is_valid_action_type(action_type):
+        if action_type not in _SUPPORTED_ACTION_TYPES_SET:
             raise ValueError(f"Invalid action type: {action_type}. Must be one of: {SUPPORTED_ACTION_TYPES}")
         
-        # Create and compile workflow
-        workflow = self.create_workflow()
-        compiled_workflow = workflow.compile()
+        if use_langgraph is None:
+            use_langgraph = self.use_langgraph
         
         # Initialize state
         initial_state: WorkerAgentState = {
@@ -432,11 +662,12 @@ class WorkerAgent:
             "status": "initializing",
             "error_message": "",
             "scan_completed": False,
-            "items_scanned": [],
+            "items_scanned": {},
             "total_items": 0,
             "scan_duration": "",
             "anomalies": [],
             "scan_confidence": 0.0,
+            "poa_parts": {},
             "poa_package": {},
             "package_hash": "",
             "ipfs_hash": "",
@@ -444,26 +675,42 @@ class WorkerAgent:
             "submission_id": 0,
             "gas_used": 0,
             "verification_fee_paid": 0.0,
+            "started_at_ns": 0,
+            "completed_at_ns": 0,
+            "elapsed_ms": 0,
             "started_at": "",
             "completed_at": ""
         }
         
         try:
-            # Execute workflow
-            final_state = compiled_workflow.invoke(initial_state)
+            if use_langgraph:
+                # Build and compile the workflow once; its nodes are bound to self only, so it is reusable
+                if self._compiled_workflow is None:
+                    self._compiled_workflow = self.create_workflow().compile()
+                final_state = await self._compiled_workflow.ainvoke(initial_state)
+            else:
+                # No checkpointing or routing needed: call the nodes directly, in order
+                final_state = dict(initial_state)
+                for _, node in WORKFLOW_NODES:
+                    update = node(self, final_state)
+                    if asyncio.iscoroutine(update):
+                        update = await update
+                    if "poa_parts" in update:
+                        # Merge like the poa_parts reducer in the graph
+                        update["poa_parts"] = final_state["poa_parts"] | update["poa_parts"]
+                    final_state.update(update)
             
-            logger.info(f"🏁 Verification completed with status: {final_state['status']}")
+            logger.info("🏁 Verification completed with status: %s", final_state['status'])
             
-            return final_state
+            return _stamp_times(final_state)
             
         except Exception as e:
-            logger.error(f"❌ Workflow execution failed: {e}")
-            return {
+            logger.error("❌ Workflow execution failed: %s", e)
+            return _stamp_times({
                 **initial_state,
                 "status": "failed",
-                "error_message": str(e),
-                "completed_at": datetime.now(timezone.utc).isoformat()
-            }
+                "error_message": str(e)
+            })
 
 def main():
     """CLI interface for Worker Agent"""
@@ -0,0 +1,11 @@
+"""
+Importable alias for the Worker Agent
+The agent lives in agents/worker-agent/, which is not a valid module name, so import it from here:
+
+    from agents.worker_agent import WorkerAgent
+"""
+
+from importlib import import_module
+
+# Imported once and cached in sys.modules, so repeat imports reuse the compiled module
+WorkerAgent = import_module("agents.worker-agent.worker_agent").WorkerAgent
@@ -6,33 +6,45 @@ Demonstrates the full DVN workflow with Worker and Verifier Agents
 import os
 import sys
 import time
-import json
-from datetime import datetime, timezone
-from typing import List, Dict, Any
-import importlib.util
+import functools
+import multiprocessing as mp
+from typing import List, Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from itertools import islice
+from statistics import fmean
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-# Import agents - need to handle hyphenated directory names
-import importlib.util
-import os
+from agents.worker_agent import WorkerAgent
+from agents.verifier_agent import VerifierAgent
+from agents.shared.constants import *
+from agents.shared.ipfs_client import IPFSClient
 
-# Load Worker Agent
-worker_agent_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "agents", "worker-agent", "worker_agent.py")
-spec = importlib.util.spec_from_file_location("worker_agent", worker_agent_path)
-worker_agent_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(worker_agent_module)
-WorkerAgent = worker_agent_module.WorkerAgent
+# Demo configuration
+DEMO_CONFIG = {
+    "store_scenarios": [
+        {"store_id": "store_123", "section": "electronics", "action": "KiranaAI_StockReport"},
+        {"store_id": "store_456", "section": "smartphones", "action": "KiranaAI_InventoryAudit"},
+        {"store_id": "store_789", "section": "accessories", "action": "KiranaAI_ReorderAlert"}
+    ],
+    "verifier_agents": [
+        {"specialization": "electronics", "count": 2},
+        {"specialization": "inventory", "count": 2}, 
+        {"specialization": "general", "count": 1}
+    ]
+}
 
-# Load Verifier Agent
-verifier_agent_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "agents", "verifier-agent", "verifier_agent.py")
-spec = importlib.util.spec_from_file_location("verifier_agent", verifier_agent_path)
-verifier_agent_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(verifier_agent_module)
-VerifierAgent = verifier_agent_module.VerifierAgent
+# Scenario-invariant values, computed once at import
+_CONSENSUS_PCT = CONSENSUS_CONFIG["consensus_threshold_percent"]
+_CONSENSUS_THRESHOLD = _CONSENSUS_PCT / 100
+_N_SCENARIOS = len(DEMO_CONFIG["store_scenarios"])
+_TOTAL_VERIFIERS = sum(va["count"] for va in DEMO_CONFIG["verifier_agents"])
 
-from agents.shared.constants import *
+# (specialization, agent_id) of every verifier agent, in configuration order
+_VERIFIER_TASKS = [(va["specialization"], f"va_{va['specialization']}_{j+1:03d}")
+                   for va in DEMO_CONFIG["verifier_agents"] for j in range(va["count"])]
 
 def print_section(title: str, width: int = 80):
     """Print a formatted section header"""
@@ -46,8 +58,75 @@ def print_subsection(title: str, width: int = 60):
     print(f" {title}")
     print(f"{'-' * width}")
 
-def run_full_dvn_demo():
-    """Run the complete DVN demonstration"""
+# Agents and their IPFS client are created once per process and reused by every scenario it runs
+@functools.lru_cache(maxsize=None)
+def _get_ipfs_client() -> IPFSClient:
+    """Get the process's IPFS client, shared by all agents"""
+    return IPFSClient(IPFS_NODE_URL)
+
+@functools.lru_cache(maxsize=None)
+def _get_worker_agent() -> WorkerAgent:
+    """Get the process's shared Worker Agent"""
+    return WorkerAgent(private_key="simulation", ipfs_client=_get_ipfs_client())
+
+@functools.lru_cache(maxsize=None)
+def _get_verifier_agent(specialization: str, agent_id: str) -> VerifierAgent:
+    """Get the process's shared Verifier Agent for an agent ID"""
+    return VerifierAgent(
+        private_key="simulation",
+        agent_id=agent_id,
+        specialization=specialization,
+        ipfs_client=_get_ipfs_client()
+    )
+
+@functools.lru_cache(maxsize=32)
+def _fetch_submission(submission_id: str) -> Dict[str, Any]:
+    """Fetch a submission's data once for all verifiers that evaluate it"""
+    return _get_verifier_agent(*_VERIFIER_TASKS[0]).fetch_submission(submission_id)
+
+def _evaluate(specialization: str, agent_id: str, submission_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate a prefetched submission with a shared Verifier Agent"""
+    return _get_verifier_agent(specialization, agent_id).evaluate_submission(submission_id, payload=payload)
+
+def _run_scenario(scenario: Dict[str, str], tasks: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Run one scenario's worker verification and verifier evaluations, without printing
+    
+    Scenarios share no state, so this can also run in a pool worker process.
+    
+    Args:
+        scenario: Store scenario (store_id, section, action)
+        tasks: (specialization, agent_id) of every verifier agent
+    """
+    worker_result = _get_worker_agent().execute_verification(
+        store_id=scenario["store_id"],
+        section=scenario["section"],
+        action_type=scenario["action"]
+    )
+    
+    if worker_result["status"] != "submitted":
+        return {"worker_result": worker_result, "submission_id": None, "verifier_results": []}
+    
+    # Generate unique submission ID for verifiers
+    submission_id = f"{scenario['store_id']}_{scenario['action']}_{worker_result['submission_id']}"
+    payload = _fetch_submission(submission_id)
+    
+    # The evaluations are independent, so run them all concurrently and report in order
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = [executor.submit(_evaluate, spec, agent_id, submission_id, payload) for spec, agent_id in tasks]
+        verifier_results = [future.result() for future in futures]
+    
+    return {"worker_result": worker_result, "submission_id": submission_id, "verifier_results": verifier_results}
+
+def run_full_dvn_demo(parallel_scenarios: bool = False, interactive: bool = False):
+    """
+    Run the complete DVN demonstration
+    
+    Args:
+        parallel_scenarios: Run all scenarios at once in a process pool, then report them
+        interactive: Wait for Enter between scenarios and pause between phases; off for
+            unattended and benchmark runs
+    """
     
     print_section("🌟 ChaosChain DVN PoC - Complete End-to-End Demo")
     print("This demonstration showcases the full Decentralized Verification Network workflow:")
@@ -56,30 +135,30 @@ def run_full_dvn_demo():
     print("3. Consensus mechanism processes attestations")
     print("4. Final verification result is determined")
     
-    # Demo configuration
-    demo_config = {
-        "store_scenarios": [
-            {"store_id": "store_123", "section": "electronics", "action": "KiranaAI_StockReport"},
-            {"store_id": "store_456", "section": "smartphones", "action": "KiranaAI_InventoryAudit"},
-            {"store_id": "store_789", "section": "accessories", "action": "KiranaAI_ReorderAlert"}
-        ],
-        "verifier_agents": [
-            {"specialization": "electronics", "count": 2},
-            {"specialization": "inventory", "count": 2}, 
-            {"specialization": "general", "count": 1}
-        ]
-    }
-    
     print(f"\n📋 Demo Configuration:")
-    print(f"   • {len(demo_config['store_scenarios'])} different store scenarios")
-    print(f"   • {sum(va['count'] for va in demo_config['verifier_agents'])} verifier agents")
+    print(f"   • {_N_SCENARIOS} different store scenarios")
+    print(f"   • {_TOTAL_VERIFIERS} verifier agents")
     print(f"   • Full simulation mode (no real blockchain transactions)")
     
-    input("\nPress Enter to start the demo...")
+    scenarios = DEMO_CONFIG["store_scenarios"]
+    run_scenario = functools.partial(_run_scenario, tasks=_VERIFIER_TASKS)
+    
+    if interactive:
+        input("\nPress Enter to start the demo...")
+    
+    if parallel_scenarios:
+        # Scenarios share no state; spawn gives each worker a fresh interpreter
+        print(f"\n🔄 Running {_N_SCENARIOS} scenarios in parallel...")
+        sys.stdout.flush()
+        with mp.get_context("spawn").Pool(processes=min(_N_SCENARIOS, os.cpu_count() or 1)) as pool:
+            scenario_results = pool.map(run_scenario, scenarios)
+    else:
+        # Lazy, so each scenario runs just before it is reported
+        scenario_results = map(run_scenario, scenarios)
     
-    # Run demonstrations for each store scenario
-    for i, scenario in enumerate(demo_config["store_scenarios"], 1):
-        print_section(f"📦 Scenario {i}/{len(demo_config['store_scenarios'])}: {scenario['store_id']} - {scenario['section']}")
+    # Report each store scenario
+    for i, (scenario, scenario_result) in enumerate(zip(scenarios, scenario_results), 1):
+        print_section(f"📦 Scenario {i}/{_N_SCENARIOS}: {scenario['store_id']} - {scenario['section']}")
         
         # Phase 1: Worker Agent Submission
         print_subsection("🤖 Phase 1: Worker Agent Verification")
@@ -87,15 +166,7 @@ def run_full_dvn_demo():
         print(f"Section: {scenario['section']}")
         print(f"Action: {scenario['action']}")
         
-        # Initialize Worker Agent
-        worker_agent = WorkerAgent(private_key="simulation")
-        
-        print(f"\n🔄 Executing inventory verification...")
-        worker_result = worker_agent.execute_verification(
-            store_id=scenario["store_id"],
-            section=scenario["section"],
-            action_type=scenario["action"]
-        )
+        worker_result = scenario_result["worker_result"]
         
         if worker_result["status"] != "submitted":
             print(f"❌ Worker Agent failed: {worker_result.get('error_message', 'Unknown error')}")
@@ -109,39 +180,31 @@ def run_full_dvn_demo():
         print(f"   • Transaction Hash: {worker_result['tx_hash']}")
         print(f"   • Submission ID: {worker_result['submission_id']}")
         
-        # Generate unique submission ID for verifiers
-        submission_id = f"{scenario['store_id']}_{scenario['action']}_{worker_result['submission_id']}"
+        submission_id = scenario_result["submission_id"]
+        verifier_results = scenario_result["verifier_results"]
         
-        time.sleep(1)  # Brief pause for dramatic effect
+        if interactive:
+            sys.stdout.flush()
+            time.sleep(1)  # Brief pause for dramatic effect
         
         # Phase 2: Verifier Agent Evaluations
         print_subsection("🔍 Phase 2: Verifier Agent Evaluations")
+        print(f"🔍 {_TOTAL_VERIFIERS} verifier agents evaluated submission {submission_id}")
         
-        verifier_results = []
-        attestation_count = 0
+        # Consensus and per-specialization statistics, gathered in the same pass as the report
+        successful_evaluations = approval_count = 0
+        spec_scores = defaultdict(list)
+        spec_decisions = defaultdict(list)
+        unique_notes = []  # First 3 unique evaluation notes, in verifier order
+        results = zip(_VERIFIER_TASKS, verifier_results)
         
-        for va_config in demo_config["verifier_agents"]:
+        for va_config in DEMO_CONFIG["verifier_agents"]:
             specialization = va_config["specialization"]
             count = va_config["count"]
             
             print(f"\n📊 {specialization.upper()} Verifier Agents ({count} agents):")
             
-            for j in range(count):
-                agent_id = f"va_{specialization}_{j+1:03d}"
-                
-                # Initialize Verifier Agent
-                verifier_agent = VerifierAgent(
-                    private_key="simulation",
-                    agent_id=agent_id,
-                    specialization=specialization
-                )
-                
-                print(f"   🔍 {agent_id} evaluating submission...")
-                
-                # Evaluate submission
-                eval_result = verifier_agent.evaluate_submission(submission_id)
-                verifier_results.append(eval_result)
-                
+            for (_, agent_id), eval_result in islice(results, count):
                 if eval_result["status"] == "completed":
                     decision = "APPROVE" if eval_result["attestation_decision"] else "REJECT"
                     score = eval_result["overall_score"]
@@ -149,28 +212,36 @@ def run_full_dvn_demo():
                     
                     print(f"   ✅ {agent_id}: {decision} (score: {score:.2f}, confidence: {confidence:.2f})")
                     
-                    if eval_result["attestation_decision"]:
-                        attestation_count += 1
+                    successful_evaluations += 1
+                    approval_count += eval_result["attestation_decision"]
+                    evidence = eval_result["attestation_evidence"]
+                    spec_scores[evidence["specialization"]].append(score)
+                    spec_decisions[evidence["specialization"]].append(eval_result["attestation_decision"])
+                    
+                    for note in evidence.get("evaluation_notes", ()):
+                        if len(unique_notes) == 3:
+                            break
+                        if note not in unique_notes:
+                            unique_notes.append(note)
                 else:
                     print(f"   ❌ {agent_id}: FAILED - {eval_result.get('error_message', 'Unknown error')}")
         
-        time.sleep(1)
+        if interactive:
+            sys.stdout.flush()
+            time.sleep(1)
         
         # Phase 3: Consensus Analysis
         print_subsection("🎯 Phase 3: Consensus Analysis")
         
         total_verifiers = len(verifier_results)
-        successful_evaluations = len([r for r in verifier_results if r["status"] == "completed"])
-        approval_count = attestation_count
         rejection_count = successful_evaluations - approval_count
         
         if successful_evaluations == 0:
             consensus_result = "FAILED - No successful evaluations"
         else:
             approval_rate = approval_count / successful_evaluations
-            consensus_threshold = CONSENSUS_CONFIG["consensus_threshold_percent"] / 100
             
-            if approval_rate >= consensus_threshold:
+            if approval_rate >= _CONSENSUS_THRESHOLD:
                 consensus_result = "VERIFIED ✅"
             else:
                 consensus_result = "REJECTED ❌"
@@ -181,45 +252,30 @@ def run_full_dvn_demo():
         print(f"   • Approvals: {approval_count}")
         print(f"   • Rejections: {rejection_count}")
         print(f"   • Approval Rate: {approval_count/successful_evaluations*100:.1f}%" if successful_evaluations > 0 else "   • Approval Rate: N/A")
-        print(f"   • Consensus Threshold: {CONSENSUS_CONFIG['consensus_threshold_percent']}%")
+        print(f"   • Consensus Threshold: {_CONSENSUS_PCT}%")
         print(f"   • Final Result: {consensus_result}")
         
         # Phase 4: Detailed Results
         print_subsection("📋 Phase 4: Detailed Analysis")
         
         if successful_evaluations > 0:
-            # Calculate average scores by specialization
-            specialization_stats = {}
-            for result in verifier_results:
-                if result["status"] == "completed":
-                    spec = result["attestation_evidence"]["specialization"]
-                    if spec not in specialization_stats:
-                        specialization_stats[spec] = {"scores": [], "decisions": []}
-                    
-                    specialization_stats[spec]["scores"].append(result["overall_score"])
-                    specialization_stats[spec]["decisions"].append(result["attestation_decision"])
-            
+            # Average scores by specialization
             print("🏷️  Results by Specialization:")
-            for spec, stats in specialization_stats.items():
-                avg_score = sum(stats["scores"]) / len(stats["scores"])
-                approval_rate = sum(stats["decisions"]) / len(stats["decisions"]) * 100
+            for spec, scores in spec_scores.items():
+                avg_score = fmean(scores)
+                approval_rate = fmean(spec_decisions[spec]) * 100
                 print(f"   • {spec.upper()}: Avg Score {avg_score:.2f}, Approval Rate {approval_rate:.0f}%")
             
             # Show evaluation notes
-            all_notes = []
-            for result in verifier_results:
-                if result["status"] == "completed" and result.get("attestation_evidence", {}).get("evaluation_notes"):
-                    all_notes.extend(result["attestation_evidence"]["evaluation_notes"])
-            
-            if all_notes:
+            if unique_notes:
                 print(f"\n📝 Evaluation Notes:")
-                unique_notes = list(set(all_notes))
-                for note in unique_notes[:3]:  # Show top 3 unique notes
+                for note in unique_notes:
                     print(f"   • {note}")
         
         print(f"\n⏱️  Scenario {i} completed in simulated real-time")
+        sys.stdout.flush()
         
-        if i < len(demo_config["store_scenarios"]):
+        if interactive and i < _N_SCENARIOS:
             input("\nPress Enter to continue to next scenario...")
     
     # Final Summary
@@ -300,10 +356,16 @@ if __name__ == "__main__":
     
     parser = argparse.ArgumentParser(description="ChaosChain DVN Demo")
     parser.add_argument("--quick", action="store_true", help="Run quick demo instead of full demo")
+    parser.add_argument("--parallel-scenarios", action="store_true", help="Run the store scenarios in parallel worker processes")
+    parser.add_argument("--interactive", action="store_true", help="Pause for Enter between scenarios and between phases")
     
     args = parser.parse_args()
     
+    # Block-buffer stdout and flush only at phase and scenario boundaries, rather than
+    # issuing a write per printed line (input() flushes before prompting)
+    sys.stdout.reconfigure(line_buffering=False)
+    
     if args.quick:
         run_quick_demo()
     else:
-        run_full_dvn_demo() 
\ No newline at end of file
+        run_full_dvn_demo(parallel_scenarios=args.parallel_scenarios, interactive=args.interactive) 
\ No newline at end of file